@@ -56,16 +56,22 @@ EXIT_NOT_FOUND  = 3   # Record, note, or template not found
 EXIT_VALIDATION = 4   # Field validation failure (required, accepted_values, type)
 
 import argparse
+import concurrent.futures
+import copy
 import datetime
+import functools
 import hashlib
 import json
 import os
+import shutil
 import sqlite3
+import stat
+import string
 import subprocess
 import sys
 import tempfile
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field as dataclass_field
 from pathlib import Path
 from typing import Optional, Dict, Any, List, TYPE_CHECKING, Union
 from types import SimpleNamespace
@@ -73,19 +79,6 @@ import select
 import secrets
 import time
 from string import Template as StringTemplate
-try:
-    import tomllib
-except ImportError:
-    import tomli as tomllib
-try:
-    import tomli_w
-except ImportError:
-    tomli_w = None
-    raise RuntimeError(
-        "tomli_w not available. Cannot write TOML config.\n"
-        "Install with: pip install tomli_w"
-    )
-
 try:
     import yaml
 except ImportError:
@@ -95,6 +88,54 @@ except ImportError:
         "Install with: pip install pyyaml"
     )
 
+# TOML libraries are imported on first use rather than at startup, so
+# commands that never read or write a config file skip the import cost.
+
+@functools.lru_cache(maxsize=None)
+def _toml_backend() -> tuple:
+    """
+    Resolve the TOML parser once: rtoml if installed, else tomllib/tomli.
+
+    Returns:
+        (load, errors): load(path) -> dict, and the tuple of parse-error types
+    """
+    try:
+        import rtoml  # optional Rust-backed parser; much faster on large configs
+    except ImportError:
+        rtoml = None
+    if rtoml is not None:
+        return rtoml.load, (rtoml.TomlParsingError,)
+
+    try:
+        import tomllib
+    except ImportError:
+        import tomli as tomllib
+
+    def load(path: Path) -> dict:
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+
+    return load, (tomllib.TOMLDecodeError,)
+
+
+def _toml_load(path: Path) -> dict:
+    """Parse a TOML file with the backend chosen by _toml_backend()."""
+    return _toml_backend()[0](path)
+
+
+@functools.lru_cache(maxsize=None)
+def _require_tomli_w():
+    """Import tomli_w for writing TOML, or raise RuntimeError if missing."""
+    try:
+        import tomli_w
+    except ImportError:
+        raise RuntimeError(
+            "tomli_w not available. Cannot write TOML config.\n"
+            "Install with: pip install tomli_w"
+        )
+    return tomli_w
+
+
 """
 YAMLSerializer
 """
@@ -865,71 +906,103 @@ class IDGenerator:
         notefn = f"{prefix}-{IDGenerator.to_base36(epochtime)}{rand}"
         return notefn.upper()
 
-# ============================================================================
-# DICTIONARY HELPER
-# ============================================================================
-
-class ConfigDict(dict):
-    """Dict that also supports dot notation for attribute access"""
-    
-    def __getattr__(self, key):
-        try:
-            value = self[key]
-            # Recursively wrap nested dicts
-            if isinstance(value, dict) and not isinstance(value, ConfigDict):
-                value = ConfigDict(value)
-                self[key] = value
-            return value
-        except KeyError:
-            raise AttributeError(f"No attribute '{key}'")
-    
-    def __setattr__(self, key, value):
-        self[key] = value
-    
-    def __delattr__(self, key):
-        try:
-            del self[key]
-        except KeyError:
-            raise AttributeError(f"No attribute '{key}'")
-
 # ============================================================================
 # Project Configuration
 # ============================================================================
 
+@dataclass(frozen=True, slots=True)
 class SpecialField:
-    """Definition of a special (meta) field."""
+    """
+    Definition of a special (meta) field.
+
+    Instances are immutable and hashable; from_dict() can intern them in a
+    caller-owned pool so that identical definitions shared by several
+    templates are a single object.
+    """
+
+    name: str
+    field_type: str  # "single" or "multi"
+    value_type: str = "string"  # "string", "integer", "float", "securestring"
+    accepted_values: tuple = ()
+    editable: bool = True
+    enabled: bool = True
+    required: bool = False
+    system_value: Optional[str] = None  # e.g., "datetime", "user_email", "${datetime}"
+    default: Optional[str] = None
+    index_values: bool = True
+    ignore_updates: bool = False
+    # accepted_values as a set for membership tests (None if unhashable)
+    _accepted_set: Optional[frozenset] = dataclass_field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Accept any iterable (or None) for accepted_values; store as a tuple
+        object.__setattr__(self, "accepted_values", tuple(self.accepted_values or ()))
+        try:
+            object.__setattr__(self, "_accepted_set", frozenset(self.accepted_values))
+        except TypeError:
+            pass
     
-    def __init__(
-        self,
+    @classmethod
+    def from_dict(
+        cls,
         name: str,
-        field_type: str,  # "single" or "multi"
-        value_type: str = "string",  # "string", "integer", "float", "securestring"
-        accepted_values: Optional[List[str]] = None,
-        editable: bool = True,
-        enabled: bool = True,
-        required: bool = False,
-        system_value: Optional[str] = None,
-        default: Optional[str] = None,
-        index_values: bool = True,
-        ignore_updates: bool = False,
-    ):
-        self.name = name
-        self.field_type = field_type  # single vs multi-value
-        self.value_type = value_type
-        self.accepted_values = accepted_values or []
-        self.editable = editable
-        self.enabled = enabled
-        self.required = required
-        self.system_value = system_value  # e.g., "datetime", "user_email", "${datetime}"
-        self.default = default
-        self.index_values = index_values
-        self.ignore_updates = ignore_updates
+        field_def: dict,
+        pool: Optional[Dict[tuple, "SpecialField"]] = None,
+    ) -> "SpecialField":
+        """
+        Build a SpecialField from its config table, applying defaults.
+
+        Args:
+            name: Field name
+            field_def: The field's config table
+            pool: Interned instances to reuse an identical definition from
+                (and add this one to); None to skip interning
+        """
+        field = cls(
+            name=name,
+            field_type=field_def.get("type", "single"),
+            value_type=field_def.get("value_type", "string"),
+            accepted_values=field_def.get("accepted_values", ()),
+            editable=field_def.get("editable", True),
+            enabled=field_def.get("enabled", True),
+            required=field_def.get("required", False),
+            system_value=field_def.get("system_value", None),
+            default=field_def.get("default", None),
+            index_values=field_def.get("index_values", True),
+            ignore_updates=field_def.get("ignore_updates", False),
+        )
+        if pool is None:
+            return field
+        try:
+            return pool.setdefault(field._intern_key(), field)
+        except TypeError:
+            # Unhashable value in the config (e.g. a list default) - don't intern
+            return field
+    
+    def _intern_key(self) -> tuple:
+        """
+        Pool key: every compared field value paired with its type, so that
+        definitions differing only in type (1, 1.0, True) stay distinct.
+        """
+        return tuple(
+            (type(value), tuple((type(v), v) for v in value) if isinstance(value, tuple) else value)
+            for value in (
+                self.name, self.field_type, self.value_type, self.accepted_values,
+                self.editable, self.enabled, self.required, self.system_value,
+                self.default, self.index_values, self.ignore_updates,
+            )
+        )
     
     def validate(self, value: Any) -> bool:
         """Check if value is acceptable."""
-        if self.accepted_values and str(value) not in self.accepted_values:
-            return False
-        return True
+        return not self.invalid_values((value,))
+    
+    def invalid_values(self, values: Any) -> List[Any]:
+        """Return the values (compared as strings) not in accepted_values, in order."""
+        if not self.accepted_values:
+            return []
+        accepted = self._accepted_set if self._accepted_set is not None else self.accepted_values
+        return [v for v in values if str(v) not in accepted]
     
     def is_system_field(self) -> bool:
         """Check if this field has a system-derived value."""
@@ -940,26 +1013,26 @@ class SpecialField:
         return self.editable and self.system_value is not None
 
 
+@dataclass(frozen=True, eq=False)
 class Template:
-    """Definition of a template configuration."""
-    
-    def __init__(
-        self,
-        name: str,
-        record_prefix: Optional[str] = None,
-        note_prefix: Optional[str] = None,
-        record_template_recordid: Optional[str] = None,
-        note_template_recordid: Optional[str] = None,
-        record_special_fields: Optional[Dict[str, dict]] = None,
-        note_special_fields: Optional[Dict[str, dict]] = None,
-    ):
-        self.name = name
-        self.record_prefix = record_prefix
-        self.note_prefix = note_prefix
-        self.record_template_recordid = record_template_recordid
-        self.note_template_recordid = note_template_recordid
-        self.record_special_fields = record_special_fields or {}
-        self.note_special_fields = note_special_fields or {}
+    """
+    Definition of a template configuration.
+
+    Immutable once parsed; hashes by identity since the special field
+    tables are kept as the raw config dicts.
+    """
+
+    name: str
+    record_prefix: Optional[str] = None
+    note_prefix: Optional[str] = None
+    record_template_recordid: Optional[str] = None
+    note_template_recordid: Optional[str] = None
+    record_special_fields: Dict[str, dict] = None
+    note_special_fields: Dict[str, dict] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "record_special_fields", self.record_special_fields or {})
+        object.__setattr__(self, "note_special_fields", self.note_special_fields or {})
     
     def get_record_prefix_override(self) -> Optional[str]:
         """Get record prefix override for this template, if set."""
@@ -989,6 +1062,13 @@ class Template:
 class ProjectConfig:
     """Project-level configuration (stored in .aver/config.toml)."""
     
+    # Presence checks used by validate_required_fields(), keyed by value_type.
+    _REQUIRED_VALUE_CHECKS = {
+        "string": lambda incident, name: any(v.strip() for v in incident.kv_strings.get(name, ())),
+        "integer": lambda incident, name: bool(incident.kv_integers.get(name)),
+        "float": lambda incident, name: bool(incident.kv_floats.get(name)),
+    }
+    
     def __init__(self, db_root: Path):
         self.db_root = db_root
         self.config_path = db_root / "config.toml"
@@ -996,19 +1076,28 @@ class ProjectConfig:
         self._record_special_fields: Dict[str, SpecialField] = {}
         self._note_special_fields: Dict[str, SpecialField] = {}
         self._templates: Dict[str, Template] = {}
+        self._required_checks: List[tuple[str, str]] = []
+        self._all_special_field_names: frozenset = frozenset()
+        self._enabled_special_field_names: frozenset = frozenset()
+        self._resolved_prefixes: Dict[Optional[str], tuple[str, str]] = {}
+        self._template_fields: Dict[str, tuple[Dict[str, SpecialField], Dict[str, SpecialField]]] = {}
+        self._resolved_special_fields: Dict[str, tuple[Dict[str, SpecialField], Dict[str, SpecialField]]] = {}
+        self._record_field_views: Dict[Optional[str], tuple[Dict[str, SpecialField], frozenset, Dict[str, SpecialField]]] = {}
         self.default_record_prefix = "REC"
         self.default_note_prefix = "NT"
         self.load()
     
     def load(self):
         """Load and parse project config."""
+        self._record_field_views = {}
+        # SpecialField intern pool for this load only (see _parse_field_dict)
+        self._field_pool: Dict[tuple, SpecialField] = {}
         if not self.config_path.exists():
             self._init_defaults()
             return
         
         try:
-            with open(self.config_path, "rb") as f:
-                self._raw_config = tomllib.load(f)
+            self._raw_config = _toml_load(self.config_path)
         except Exception as e:
             print(f"Warning: Failed to read project config: {e}", file=sys.stderr)
             self._init_defaults()
@@ -1067,9 +1156,6 @@ class ProjectConfig:
         Supports both new format (record_special_fields / note_special_fields)
         and legacy format (special_fields, which becomes record fields only).
         """
-        self._record_special_fields = {}
-        self._note_special_fields = {}
-        
         # NEW FORMAT: record_special_fields and note_special_fields
         record_fields_config = self._raw_config.get("record_special_fields", {})
         note_fields_config = self._raw_config.get("note_special_fields", {})
@@ -1081,59 +1167,40 @@ class ProjectConfig:
         if legacy_fields_config and not record_fields_config:
             record_fields_config = legacy_fields_config
         
-        # Parse record special fields
-        for field_name, field_def in record_fields_config.items():
-            field_type = field_def.get("type", "single")
-            value_type = field_def.get("value_type", "string")
-            accepted_values = field_def.get("accepted_values", [])
-            editable = field_def.get("editable", True)
-            enabled = field_def.get("enabled", True)
-            required = field_def.get("required", False)
-            system_value = field_def.get("system_value", None)
-            default = field_def.get("default", None)
-            index_values = field_def.get("index_values", True)
-            ignore_updates = field_def.get("ignore_updates", False)
-
-            self._record_special_fields[field_name] = SpecialField(
-                name=field_name,
-                field_type=field_type,
-                value_type=value_type,
-                accepted_values=accepted_values,
-                editable=editable,
-                enabled=enabled,
-                required=required,
-                system_value=system_value,
-                default=default,
-                index_values=index_values,
-                ignore_updates=ignore_updates,
-            )
+        self._record_special_fields = self._parse_field_dict(record_fields_config)
+        self._note_special_fields = self._parse_field_dict(note_fields_config)
 
-        # Parse note special fields
-        for field_name, field_def in note_fields_config.items():
-            field_type = field_def.get("type", "single")
-            value_type = field_def.get("value_type", "string")
-            accepted_values = field_def.get("accepted_values", [])
-            editable = field_def.get("editable", True)
-            enabled = field_def.get("enabled", True)
-            required = field_def.get("required", False)
-            system_value = field_def.get("system_value", None)
-            default = field_def.get("default", None)
-            index_values = field_def.get("index_values", True)
-            ignore_updates = field_def.get("ignore_updates", False)
-
-            self._note_special_fields[field_name] = SpecialField(
-                name=field_name,
-                field_type=field_type,
-                value_type=value_type,
-                accepted_values=accepted_values,
-                editable=editable,
-                enabled=enabled,
-                required=required,
-                system_value=system_value,
-                default=default,
-                index_values=index_values,
-                ignore_updates=ignore_updates,
-            )
+        # Precompute (name, value_type) for enabled+required record fields so
+        # validate_required_fields() only walks the fields it has to check.
+        self._required_checks = [
+            (field_name, field.value_type)
+            for field_name, field in self._record_special_fields.items()
+            if field.enabled and field.required
+        ]
+
+        # Name sets for is_special_field() / is_enabled_special_field(),
+        # covering both record and note fields.
+        self._all_special_field_names = (
+            frozenset(self._record_special_fields) | frozenset(self._note_special_fields)
+        )
+        self._enabled_special_field_names = frozenset(
+            field_name
+            for fields in (self._record_special_fields, self._note_special_fields)
+            for field_name, field in fields.items()
+            if field.enabled
+        )
+    
+    def _parse_field_dict(self, fields_config: Dict[str, dict]) -> Dict[str, SpecialField]:
+        """
+        Parse a {field_name: field_def} config table into SpecialField objects.
+
+        Identical definitions within one load share an instance; the pool is
+        replaced on every load() so it never outgrows the current config.
+        """
+        return {
+            field_name: SpecialField.from_dict(field_name, field_def, self._field_pool)
+            for field_name, field_def in fields_config.items()
+        }
     
     def _parse_templates(self):
         """Parse template configurations from config."""
@@ -1159,6 +1226,33 @@ class ProjectConfig:
                 record_special_fields=record_special_fields,
                 note_special_fields=note_special_fields,
             )
+        
+        # Resolve (record_prefix, note_prefix) per template once; None maps
+        # to the defaults.
+        defaults = (self.default_record_prefix, self.default_note_prefix)
+        self._resolved_prefixes = {None: defaults}
+        for template_name, template in self._templates.items():
+            self._resolved_prefixes[template_name] = (
+                template.record_prefix or defaults[0],
+                template.note_prefix or defaults[1],
+            )
+
+        # Parse each template's own (record, note) special fields once, and
+        # merge them over the global fields for get_special_fields_for_template().
+        self._template_fields = {
+            template_name: (
+                self._parse_field_dict(template.record_special_fields),
+                self._parse_field_dict(template.note_special_fields),
+            )
+            for template_name, template in self._templates.items()
+        }
+        self._resolved_special_fields = {
+            template_name: (
+                {**self._record_special_fields, **record_fields},
+                {**self._note_special_fields, **note_fields},
+            )
+            for template_name, (record_fields, note_fields) in self._template_fields.items()
+        }
     
     def get_template(self, name: str) -> Optional[Template]:
         """Get template by name."""
@@ -1191,83 +1285,47 @@ class ProjectConfig:
         Returns:
             Dictionary of special fields
         """
-        if not template_name:
-            # No template - return appropriate global fields
+        # Merged per template at load time; callers get their own copy
+        resolved = self._resolved_special_fields.get(template_name) if template_name else None
+        if not resolved:
+            # No template, or template not found - return global fields
             if for_record:
                 return self._record_special_fields.copy()
             else:
                 return self._note_special_fields.copy()
         
-        template = self.get_template(template_name)
-        if not template:
-            # Template not found - return global fields
-            if for_record:
-                return self._record_special_fields.copy()
-            else:
-                return self._note_special_fields.copy()
+        return resolved[0 if for_record else 1].copy()
+    
+    def get_record_field_views(
+        self,
+        template_name: Optional[str],
+    ) -> tuple[Dict[str, SpecialField], frozenset, Dict[str, SpecialField]]:
+        """
+        Get (fields, non-editable field names, enabled fields) for records of a template.
         
-        if for_record:
-            # For records: Start with global, add/override with template
-            fields = self._record_special_fields.copy()
-            
-            if template.has_record_special_fields():
-                # Parse and add/override template fields
-                for field_name, field_def in template.record_special_fields.items():
-                    field_type = field_def.get("type", "single")
-                    value_type = field_def.get("value_type", "string")
-                    accepted_values = field_def.get("accepted_values", [])
-                    editable = field_def.get("editable", True)
-                    enabled = field_def.get("enabled", True)
-                    required = field_def.get("required", False)
-                    system_value = field_def.get("system_value", None)
-                    default = field_def.get("default", None)
-                    ignore_updates = field_def.get("ignore_updates", False)
-
-                    fields[field_name] = SpecialField(
-                        name=field_name,
-                        field_type=field_type,
-                        value_type=value_type,
-                        accepted_values=accepted_values,
-                        editable=editable,
-                        enabled=enabled,
-                        required=required,
-                        system_value=system_value,
-                        default=default,
-                        ignore_updates=ignore_updates,
-                    )
-
-            return fields
-        else:
-            # For notes: Start with global note fields, add/override with template
-            fields = self._note_special_fields.copy()
-
-            if template.has_note_special_fields():
-                # Parse and add/override template note fields
-                for field_name, field_def in template.note_special_fields.items():
-                    field_type = field_def.get("type", "single")
-                    value_type = field_def.get("value_type", "string")
-                    accepted_values = field_def.get("accepted_values", [])
-                    editable = field_def.get("editable", True)
-                    enabled = field_def.get("enabled", True)
-                    required = field_def.get("required", False)
-                    system_value = field_def.get("system_value", None)
-                    default = field_def.get("default", None)
-                    ignore_updates = field_def.get("ignore_updates", False)
-
-                    fields[field_name] = SpecialField(
-                        name=field_name,
-                        field_type=field_type,
-                        value_type=value_type,
-                        accepted_values=accepted_values,
-                        editable=editable,
-                        enabled=enabled,
-                        required=required,
-                        system_value=system_value,
-                        default=default,
-                        ignore_updates=ignore_updates,
-                    )
-
-            return fields
+        Same fields as get_special_fields_for_template(template_name), but
+        built once per template and shared until the next load(); callers
+        must not mutate the returned dicts.
+        
+        Args:
+            template_name: Name of template, or None for global fields only
+            
+        Returns:
+            (fields, non_editable_names, enabled_fields) tuple
+        """
+        resolved = self._resolved_special_fields.get(template_name) if template_name else None
+        if not resolved:
+            template_name = None
+        views = self._record_field_views.get(template_name)
+        if views is None:
+            fields = resolved[0] if resolved else self._record_special_fields
+            views = (
+                fields,
+                frozenset(name for name, field in fields.items() if not field.editable),
+                {name: field for name, field in fields.items() if field.enabled},
+            )
+            self._record_field_views[template_name] = views
+        return views
     
     def get_record_prefix(self, template_name: Optional[str] = None) -> str:
         """
@@ -1279,12 +1337,8 @@ class ProjectConfig:
         Returns:
             Record prefix to use
         """
-        if template_name:
-            template = self.get_template(template_name)
-            if template and template.record_prefix:
-                return template.record_prefix
-        
-        return self.default_record_prefix
+        prefixes = self._resolved_prefixes
+        return prefixes.get(template_name, prefixes[None])[0]
     
     def get_note_prefix(self, template_name: Optional[str] = None) -> str:
         """
@@ -1296,12 +1350,8 @@ class ProjectConfig:
         Returns:
             Note prefix to use
         """
-        if template_name:
-            template = self.get_template(template_name)
-            if template and template.note_prefix:
-                return template.note_prefix
-        
-        return self.default_note_prefix
+        prefixes = self._resolved_prefixes
+        return prefixes.get(template_name, prefixes[None])[1]
     
     def get_note_special_fields(
         self,
@@ -1329,60 +1379,12 @@ class ProjectConfig:
         fields = self._note_special_fields.copy()
 
         # Layer on note template's note fields (if specified)
-        if note_template_name:
-            note_template = self.get_template(note_template_name)
-            if note_template and note_template.has_note_special_fields():
-                for field_name, field_def in note_template.note_special_fields.items():
-                    field_type = field_def.get("type", "single")
-                    value_type = field_def.get("value_type", "string")
-                    accepted_values = field_def.get("accepted_values", [])
-                    editable = field_def.get("editable", True)
-                    enabled = field_def.get("enabled", True)
-                    required = field_def.get("required", False)
-                    system_value = field_def.get("system_value", None)
-                    default = field_def.get("default", None)
-                    ignore_updates = field_def.get("ignore_updates", False)
-
-                    fields[field_name] = SpecialField(
-                        name=field_name,
-                        field_type=field_type,
-                        value_type=value_type,
-                        accepted_values=accepted_values,
-                        editable=editable,
-                        enabled=enabled,
-                        required=required,
-                        system_value=system_value,
-                        default=default,
-                        ignore_updates=ignore_updates,
-                    )
+        if note_template_name in self._template_fields:
+            fields.update(self._template_fields[note_template_name][1])
 
         # Override with parent template's note fields (takes precedence)
-        if parent_template_name:
-            parent_template = self.get_template(parent_template_name)
-            if parent_template and parent_template.has_note_special_fields():
-                for field_name, field_def in parent_template.note_special_fields.items():
-                    field_type = field_def.get("type", "single")
-                    value_type = field_def.get("value_type", "string")
-                    accepted_values = field_def.get("accepted_values", [])
-                    editable = field_def.get("editable", True)
-                    enabled = field_def.get("enabled", True)
-                    required = field_def.get("required", False)
-                    system_value = field_def.get("system_value", None)
-                    default = field_def.get("default", None)
-                    ignore_updates = field_def.get("ignore_updates", False)
-
-                    fields[field_name] = SpecialField(
-                        name=field_name,
-                        field_type=field_type,
-                        value_type=value_type,
-                        accepted_values=accepted_values,
-                        editable=editable,
-                        enabled=enabled,
-                        required=required,
-                        system_value=system_value,
-                        default=default,
-                        ignore_updates=ignore_updates,
-                    )
+        if parent_template_name in self._template_fields:
+            fields.update(self._template_fields[parent_template_name][1])
 
         return fields
     
@@ -1432,15 +1434,11 @@ class ProjectConfig:
     
     def is_special_field(self, name: str) -> bool:
         """Check if field is a special field (in either record or note fields)."""
-        return name in self._record_special_fields or name in self._note_special_fields
+        return name in self._all_special_field_names
     
     def is_enabled_special_field(self, name: str) -> bool:
         """Check if field is an enabled special field (in either record or note fields)."""
-        field = self._record_special_fields.get(name)
-        if field and field.enabled:
-            return True
-        field = self._note_special_fields.get(name)
-        return field is not None and field.enabled
+        return name in self._enabled_special_field_names
     
     def validate_field(self, name: str, value: Any, for_record: bool = True) -> tuple[bool, Optional[str]]:
         """
@@ -1461,7 +1459,7 @@ class ProjectConfig:
         if not field.enabled:
             return True, None  # Disabled fields pass validation
         
-        if field.accepted_values and str(value) not in field.accepted_values:
+        if not field.validate(value):
             return False, f"Invalid {name}: {value}. Accepted: {', '.join(field.accepted_values)}"
         
         return True, None
@@ -1473,23 +1471,12 @@ class ProjectConfig:
         Returns:
             (is_valid, error_message)
         """
-        for field_name, field in self._record_special_fields.items():
-            if not field.enabled or not field.required:
-                continue
-            
-            # Check if field has a value
-            has_value = False
-            if field.value_type == "string":
-                values = incident.kv_strings.get(field_name, [])
-                has_value = bool(values) and any(v.strip() for v in values)
-            elif field.value_type == "integer":
-                values = incident.kv_integers.get(field_name, [])
-                has_value = bool(values)
-            elif field.value_type == "float":
-                values = incident.kv_floats.get(field_name, [])
-                has_value = bool(values)
-            
-            if not has_value:
+        checks = self._REQUIRED_VALUE_CHECKS
+        for field_name, value_type in self._required_checks:
+            # Unknown value types have no presence check and never satisfy
+            # the requirement.
+            check = checks.get(value_type)
+            if check is None or not check(incident, field_name):
                 return False, f"Required field '{field_name}' is missing or empty"
         
         return True, None
@@ -1504,6 +1491,45 @@ class ProjectConfig:
 # ============================================================================
 
 
+class SystemValueContext:
+    """
+    Inputs for SystemValueDeriver, resolved once per record or note.
+
+    Callers build one context and reuse it for every special field of the
+    record, so identity lookups and timestamp formatting happen once and all
+    derived datetime values agree.
+    """
+
+    __slots__ = (
+        "email",
+        "handle",
+        "incident_id",
+        "update_id",
+        "template_name",
+        "is_system_update",
+        "now_dt",
+        "now_ds",
+    )
+
+    def __init__(
+        self,
+        user_identity: Optional[UserIdentity] = None,
+        incident_id: Optional[str] = None,
+        update_id: Optional[str] = None,
+        template_name: Optional[str] = None,
+        is_system_note: bool = False,
+    ):
+        now = datetime.datetime.now()
+        self.email = user_identity.email if user_identity is not None else ""
+        self.handle = user_identity.handle if user_identity is not None else ""
+        self.incident_id = incident_id if incident_id is not None else ""
+        self.update_id = update_id if update_id is not None else ""
+        self.template_name = template_name if template_name is not None else ""
+        self.is_system_update = "1" if is_system_note else "0"
+        self.now_dt = now.strftime("%Y-%m-%d %H:%M:%S")
+        self.now_ds = now.strftime("%Y-%m-%d")
+
+
 class SystemValueDeriver:
     """Derive system values for special fields."""
     
@@ -1517,29 +1543,30 @@ class SystemValueDeriver:
         'template_id',       # The template name used for creation
         'is_system_update',  # "1" for system notes, "0" for user notes
     }
+
+    # System value type -> SystemValueContext attribute holding its value
+    _CONTEXT_ATTRS = {
+        'datetime': 'now_dt',
+        'datestamp': 'now_ds',
+        'user_email': 'email',
+        'user_name': 'handle',
+        'recordid': 'incident_id',
+        'updateid': 'update_id',
+        'template_id': 'template_name',
+        'is_system_update': 'is_system_update',
+    }
     
     @staticmethod
-    def derive_value(
-        system_value_spec: str,
-        user_identity: Optional[UserIdentity] = None,
-        incident_id: Optional[str] = None,
-        update_id: Optional[str] = None,
-        template_name: Optional[str] = None,
-        is_system_note: bool = False,
-    ) -> str:
+    def derive_value(system_value_spec: str, ctx: SystemValueContext) -> str:
         """
         Derive a system value based on the specification.
 
         Args:
             system_value_spec: The system value specification (e.g., "datetime", "${datetime}")
-            user_identity: User identity for user_email and user_name
-            incident_id: Incident ID for recordid
-            update_id: Update ID for updateid
-            template_name: Template name for template_id
-            is_system_note: True when the note is system-generated (e.g., record update tracking)
+            ctx: Precomputed identity, IDs and timestamps for the record or note
 
         Returns:
-            The derived value as a string
+            The derived value as a string (empty for unknown types)
         """
         # Handle template syntax like "${datetime}"
         if system_value_spec.startswith('${') and system_value_spec.endswith('}'):
@@ -1547,62 +1574,20 @@ class SystemValueDeriver:
         else:
             value_type = system_value_spec
         
-        # Derive the value based on type
-        if value_type == 'datetime':
-            return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        elif value_type == 'datestamp':
-            return datetime.datetime.now().strftime("%Y-%m-%d")
-        
-        elif value_type == 'user_email':
-            if user_identity is None:
-                return ""
-            return user_identity.email
-        
-        elif value_type == 'user_name':
-            if user_identity is None:
-                return ""
-            return user_identity.handle
-        
-        elif value_type == 'recordid':
-            if incident_id is None:
-                return ""
-            return incident_id
-        
-        elif value_type == 'updateid':
-            if update_id is None:
-                return ""
-            return update_id
-        
-        elif value_type == 'template_id':
-            if template_name is None:
-                return ""
-            return template_name
-
-        elif value_type == 'is_system_update':
-            return "1" if is_system_note else "0"
-
-        else:
+        attr = SystemValueDeriver._CONTEXT_ATTRS.get(value_type)
+        if attr is None:
             # Unknown system value type - return empty string
             return ""
+        return getattr(ctx, attr)
     
     @staticmethod
-    def resolve_default_value(
-        default_spec: Optional[str],
-        user_identity: Optional[UserIdentity] = None,
-        incident_id: Optional[str] = None,
-        update_id: Optional[str] = None,
-        template_name: Optional[str] = None,
-    ) -> str:
+    def resolve_default_value(default_spec: Optional[str], ctx: SystemValueContext) -> str:
         """
         Resolve a default value, which may be static or reference a system value.
         
         Args:
             default_spec: Default value specification (e.g., "pending" or "${datetime}")
-            user_identity: User identity for system values
-            incident_id: Incident ID for system values
-            update_id: Update ID for system values
-            template_name: Template name for system values
+            ctx: Precomputed context for system value references
             
         Returns:
             The resolved default value
@@ -1612,13 +1597,7 @@ class SystemValueDeriver:
         
         # Check if it's a system value reference
         if default_spec.startswith('${') and default_spec.endswith('}'):
-            return SystemValueDeriver.derive_value(
-                default_spec,
-                user_identity=user_identity,
-                incident_id=incident_id,
-                update_id=update_id,
-                template_name=template_name,
-            )
+            return SystemValueDeriver.derive_value(default_spec, ctx)
         
         # Static default value
         return default_spec
@@ -1632,22 +1611,54 @@ class SystemValueDeriver:
 class DatabaseDiscovery:
     """Find and manage the incident database location."""
 
+    # Parsed user config keyed by path: (st_mtime_ns, st_size, config dict).
+    # Reused while the file on disk is unchanged; see _do_get_user_config().
+    _user_config_cache: Dict[Path, tuple] = {}
+
+    # (config, index, roots, resolved_paths) for the most recent
+    # _get_locations_index() build
+    _locations_index: Optional[tuple] = None
+
+    # (key, raw value) of invalid [locations] entries already warned about
+    _warned_locations: set = set()
+
+    # (config, {resolved library path: alias}) for find_library_alias()
+    _library_path_index: Optional[tuple] = None
+
+    # cwd -> (work tree root, common git dir), or None outside a repo;
+    # see _get_git_context()
+    _git_context_cache: Dict[Path, Optional[tuple]] = {}
+
+    # cwd -> (parent dir, .aver path) or None; see find_parent_database()
+    _parent_database_cache: Dict[Path, Optional[tuple]] = {}
+
     # =========================================================================
     # User/Project Config Paths
     # =========================================================================
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def get_user_config_path() -> Path:
-        """Return the path to the global user configuration file (~/.config/aver/user.toml)."""
-        config_dir = Path.home() / ".config" / "aver"
-        config_dir.mkdir(parents=True, exist_ok=True)
-        return config_dir / "user.toml"
+        """
+        Return the path to the global user configuration file (~/.config/aver/user.toml).
+
+        Computed once per process. The directory is not created here; readers
+        treat a missing file as "no config" and set_user_config() creates it.
+        """
+        return Path.home() / ".config" / "aver" / "user.toml"
 
     @staticmethod
+    @functools.lru_cache(maxsize=32)
     def get_project_config_path(db_root: Path) -> Path:
-        """Return the path to the project config file (.aver/config.toml)."""
+        """Return the path to the project config file (.aver/config.toml), memoized per db_root."""
         return db_root / "config.toml"
 
+    @staticmethod
+    def _looks_like_email(email: str) -> bool:
+        """Basic email shape check: an '@' whose domain part (after the last '@') contains a '.'."""
+        _, at, domain = email.rpartition("@")
+        return bool(at) and "." in domain
+
     @staticmethod
     def get_user_config() -> dict:
         """
@@ -1668,18 +1679,20 @@ class DatabaseDiscovery:
             sys.exit(EXIT_ERROR)
 
     @staticmethod
-    def dict_to_namespace(d):
+    def _get_user_config_raw() -> dict:
         """
-        Recursively convert a dictionary to SimpleNamespace for dot notation access.
-    
-        Handles nested dicts, lists of dicts, and preserves other types.
+        Return the user config already loaded and validated in this process.
+
+        Skips even the stat() freshness check done by get_user_config(); for
+        read-only accessors that just need one field. Falls back to
+        get_user_config() when nothing has been loaded yet.
         """
-        if isinstance(d, dict):
-            return SimpleNamespace(**{k: DatabaseDiscovery.dict_to_namespace(v) for k, v in d.items()})
-        elif isinstance(d, list):
-            return [DatabaseDiscovery.dict_to_namespace(item) for item in d]
-        else:
-            return d
+        cached = DatabaseDiscovery._user_config_cache.get(
+            DatabaseDiscovery.get_user_config_path()
+        )
+        if cached is not None:
+            return cached[2]
+        return DatabaseDiscovery.get_user_config()
 
     @staticmethod
     def _do_get_user_config() -> dict:
@@ -1704,26 +1717,24 @@ class DatabaseDiscovery:
             PermissionError: If config file cannot be read due to permissions
         """
 
-        def dict_to_configdict(d):
-            if isinstance(d, dict):
-                return ConfigDict({k: dict_to_configdict(v) for k, v in d.items()})
-            elif isinstance(d, list):
-                return [dict_to_configdict(item) for item in d]
-            else:
-                return d
-
         config_path = DatabaseDiscovery.get_user_config_path()
         
         # No config file is acceptable; return empty dict
-        if not config_path.exists():
+        try:
+            st = config_path.stat()
+        except FileNotFoundError:
             #return {}
-            config = { "user": { "email": "nobody@example.com", "handle": "(unknown user)"}}
-            return dict_to_configdict(config)
+            return { "user": { "email": "nobody@example.com", "handle": "(unknown user)"}}
         
+        # Unchanged since the last successful load: skip parse and validation
+        cached = DatabaseDiscovery._user_config_cache.get(config_path)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        
+        toml_load, toml_errors = _toml_backend()
         try:
-            with open(config_path, "rb") as f:
-                config = tomllib.load(f)
-        except tomllib.TOMLDecodeError as e:
+            config = toml_load(config_path)
+        except toml_errors as e:
             raise ValueError(
                 f"Invalid TOML syntax in {config_path}: {e}\n"
                 f"To reset your configuration, run:\n\n"
@@ -1739,11 +1750,16 @@ class DatabaseDiscovery:
             )
         
         # Validate required [user] fields exist
-        if "user" in config:
-            required_user_fields = ["handle", "email"]
-            missing_user_fields = [field for field in required_user_fields if field not in config["user"]]
-            
-            if missing_user_fields:
+        user = config.get("user")
+        if user is not None:
+            handle = user.get("handle")
+            email = user.get("email")
+            
+            if handle is None or email is None:
+                missing_user_fields = [
+                    field for field, value in (("handle", handle), ("email", email))
+                    if value is None
+                ]
                 raise ValueError(
                     f"User configuration at {config_path} is missing required fields: "
                     f"{', '.join(missing_user_fields)}\n\n"
@@ -1752,8 +1768,7 @@ class DatabaseDiscovery:
                 )
             
             # Validate required fields are not empty
-            for field in required_user_fields:
-                value = config["user"][field]
+            for field, value in (("handle", handle), ("email", email)):
                 if not isinstance(value, str):
                     raise ValueError(
                         f"Field '{field}' in {config_path} must be a string, "
@@ -1769,8 +1784,8 @@ class DatabaseDiscovery:
                     )
             
             # Validate email format (basic check)
-            email = config["user"]["email"].strip()
-            if "@" not in email or "." not in email.split("@")[-1]:
+            email = email.strip()
+            if not DatabaseDiscovery._looks_like_email(email):
                 raise ValueError(
                     f"Field 'email' in {config_path} appears invalid: '{email}'\n"
                     f"Expected format: user@example.com\n\n"
@@ -1781,8 +1796,8 @@ class DatabaseDiscovery:
                 )
             
             # Store trimmed versions to remove accidental whitespace
-            config["user"]["handle"] = config["user"]["handle"].strip()
-            config["user"]["email"] = email
+            user["handle"] = handle.strip()
+            user["email"] = email
         
         # Validate [libraries] section if present
         if "libraries" in config:
@@ -1814,7 +1829,7 @@ class DatabaseDiscovery:
                 # Validate per-library email if present
                 if "email" in lib_config:
                     lib_email = lib_config["email"].strip()
-                    if "@" not in lib_email or "." not in lib_email.split("@")[-1]:
+                    if not DatabaseDiscovery._looks_like_email(lib_email):
                         raise ValueError(
                             f"Library '{alias}' email appears invalid: '{lib_email}'\n"
                             f"Expected format: user@example.com"
@@ -1852,37 +1867,26 @@ class DatabaseDiscovery:
                         f'  "/my/path" = "myalias"          # library alias'
                     )
         
-        
-        return dict_to_configdict(config)
+        DatabaseDiscovery._user_config_cache[config_path] = (st.st_mtime_ns, st.st_size, config)
+        return config
 
     @staticmethod
-    def _to_plain_dict(d):
-        """
-        Recursively convert ConfigDict (or any dict subclass) back to plain dict.
-        """
-        if isinstance(d, dict):
-            return {k: DatabaseDiscovery._to_plain_dict(v) for k, v in d.items()}
-        elif isinstance(d, list):
-            return [DatabaseDiscovery._to_plain_dict(item) for item in d]
-        else:
-            return d
+    def invalidate_user_config_cache():
+        """Drop cached user config so the next read re-parses the file."""
+        DatabaseDiscovery._user_config_cache.clear()
 
     @staticmethod
     def set_user_config(config: dict):
         """Save the global user configuration."""
-        if not tomli_w:
-            raise RuntimeError(
-                "tomli_w not available. Cannot write TOML config.\n"
-                "Install with: pip install tomli_w"
-            )
+        tomli_w = _require_tomli_w()
         config_path = DatabaseDiscovery.get_user_config_path()
         config_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Deep-convert to plain dict to ensure clean serialization
-        plain_config = DatabaseDiscovery._to_plain_dict(config)
-        
+        # The user config is built from plain dicts/lists (see get_user_config),
+        # so it can be dumped as-is without a defensive deep copy.
         with open(config_path, "wb") as f:
-            tomli_w.dump(plain_config, f)
+            tomli_w.dump(config, f)
+        DatabaseDiscovery.invalidate_user_config_cache()
 
     @staticmethod
     def get_project_config(db_root: Path) -> dict:
@@ -1891,8 +1895,7 @@ class DatabaseDiscovery:
         if not config_path.exists():
             return {}
         try:
-            with open(config_path, "rb") as f:
-                return tomllib.load(f)
+            return _toml_load(config_path)
         except Exception as e:
             print(f"Warning: Failed to read project config: {e}", file=sys.stderr)
             return {}
@@ -1900,11 +1903,7 @@ class DatabaseDiscovery:
     @staticmethod
     def set_project_config(db_root: Path, config: dict):
         """Save the project configuration."""
-        if not tomli_w:
-            raise RuntimeError(
-                "tomli_w not available. Cannot write TOML config.\n"
-                "Install with: pip install tomli_w"
-            )
+        tomli_w = _require_tomli_w()
         config_path = DatabaseDiscovery.get_project_config_path(db_root)
         with open(config_path, "wb") as f:
             tomli_w.dump(config, f)
@@ -1913,6 +1912,105 @@ class DatabaseDiscovery:
     # Git Identity
     # =========================================================================
 
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _read_git_identity() -> Optional[tuple]:
+        """
+        Read (user.name, user.email) for the current directory.
+
+        Tries the global and repository config files directly first (no git
+        process); falls back to a single `git config` call whenever they are
+        not conclusive. Memoized for the life of the process; returns None if
+        either value is unset or git is unavailable.
+        """
+        identity = DatabaseDiscovery._read_git_identity_from_files()
+        if identity is not None:
+            return identity
+        
+        try:
+            result = subprocess.run(
+                ["git", "config", "--get-regexp", r"^user\.(name|email)$"],
+                capture_output=True, text=True, check=True,
+            )
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            return None
+        
+        # One "key value" line per definition, lowest precedence first, so the
+        # last occurrence wins (same as `git config <key>`).
+        values = {}
+        for line in result.stdout.splitlines():
+            key, _, value = line.partition(" ")
+            values[key] = value.strip()
+        
+        name = values.get("user.name")
+        email = values.get("user.email")
+        if name and email:
+            return name, email
+        return None
+
+    @staticmethod
+    def _read_git_identity_from_files() -> Optional[tuple]:
+        """
+        Parse user.name/user.email from git's config files without running git.
+
+        Reads the global files (XDG, then ~/.gitconfig) and the repository's
+        config, later files overriding earlier ones as git does. The
+        system file is not read: it has the lowest precedence, so it only
+        matters when these files don't set both values.
+
+        Returns None (meaning "ask git") unless both values were found with
+        certainty: GIT_CONFIG* environment overrides, include/includeIf
+        sections, per-worktree config, and quoted or escaped values all defer
+        to git.
+        """
+        if any(key.startswith("GIT_CONFIG") or key == "GIT_DIR" for key in os.environ):
+            return None
+        
+        xdg_home = os.environ.get("XDG_CONFIG_HOME") or str(Path.home() / ".config")
+        config_files = [Path(xdg_home) / "git" / "config", Path.home() / ".gitconfig"]
+        git_context = DatabaseDiscovery._get_git_context()
+        if git_context is not None:
+            config_files.append(git_context[1] / "config")
+        
+        values = {}
+        for config_file in config_files:
+            try:
+                text = config_file.read_text(encoding="utf-8")
+            except FileNotFoundError:
+                continue
+            except (OSError, UnicodeDecodeError):
+                return None
+            
+            section = None
+            for raw_line in text.splitlines():
+                line = raw_line.strip()
+                if not line or line[0] in "#;":
+                    continue
+                if line[0] == "[":
+                    header, bracket, rest = line[1:].partition("]")
+                    section = header.strip().lower()
+                    if not bracket or rest.strip() or section.startswith("include"):
+                        return None
+                    continue
+                if section not in ("user", "extensions"):
+                    continue
+                key, _, value = line.partition("=")
+                key = key.strip().lower()
+                if section == "extensions":
+                    if key == "worktreeconfig":
+                        return None  # config.worktree may override
+                elif key in ("name", "email"):
+                    value = value.strip()
+                    if any(ch in value for ch in '"\\#;'):
+                        return None
+                    values[key] = value
+        
+        name = values.get("name")
+        email = values.get("email")
+        if name and email:
+            return name, email
+        return None
+
     @staticmethod
     def get_git_identity() -> Optional[dict]:
         """
@@ -1922,23 +2020,89 @@ class DatabaseDiscovery:
             Dict with 'handle' and 'email' keys, or None if not in a git repo
             or git identity is not configured.
         """
+        identity = DatabaseDiscovery._read_git_identity()
+        if identity is None:
+            return None
+        return {"handle": identity[0], "email": identity[1]}
+
+    @staticmethod
+    def get_git_repo_root(cwd: Optional[Path] = None) -> Optional[Path]:
+        """
+        Return the root of the git work tree containing cwd, or None.
+
+        Results are cached per cwd for the life of the process.
+
+        Args:
+            cwd: Directory to start from (defaults to the current directory)
+        """
+        git_context = DatabaseDiscovery._get_git_context(cwd)
+        return git_context[0] if git_context is not None else None
+
+    @staticmethod
+    def _get_git_context(cwd: Optional[Path] = None) -> Optional[tuple]:
+        """
+        Return (work tree root, common git dir) for cwd, or None outside a repo.
+
+        Cached per cwd for the life of the process.
+        """
+        if cwd is None:
+            cwd = Path.cwd()
+        cache = DatabaseDiscovery._git_context_cache
+        if cwd not in cache:
+            cache[cwd] = DatabaseDiscovery._find_git_context(cwd)
+        return cache[cwd]
+
+    @staticmethod
+    def _find_git_context(cwd: Path) -> Optional[tuple]:
+        """
+        Locate the git work tree root and common git dir for cwd.
+
+        Walks up looking for a .git directory (one stat per level while there
+        is no .git entry), which answers the common case -- including "not in
+        a repo" -- without spawning git. Defers to a single
+        `git rev-parse --show-toplevel --git-common-dir` when .git is a file
+        (worktrees, submodules), when GIT_DIR/GIT_WORK_TREE are set, or when
+        cwd is inside a .git directory.
+        """
+        if (
+            "GIT_DIR" not in os.environ
+            and "GIT_WORK_TREE" not in os.environ
+            and ".git" not in cwd.parts
+        ):
+            current = os.fspath(cwd)
+            while True:
+                git_entry = os.path.join(current, ".git")
+                try:
+                    mode = os.stat(git_entry).st_mode
+                except OSError:
+                    mode = 0
+                if stat.S_ISDIR(mode):
+                    if os.path.isfile(os.path.join(git_entry, "HEAD")):
+                        root = Path(current).resolve()
+                        return root, root / ".git"
+                elif stat.S_ISREG(mode):
+                    break  # gitdir pointer: let git resolve it
+                parent = os.path.dirname(current)
+                if parent == current:
+                    return None
+                current = parent
+
         try:
-            name_result = subprocess.run(
-                ["git", "config", "user.name"],
-                capture_output=True, text=True, check=True,
-            )
-            email_result = subprocess.run(
-                ["git", "config", "user.email"],
-                capture_output=True, text=True, check=True,
+            result = subprocess.run(
+                ["git", "rev-parse", "--show-toplevel", "--git-common-dir"],
+                cwd=cwd,
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                text=True,
+                check=True,
             )
-            name = name_result.stdout.strip()
-            email = email_result.stdout.strip()
-            
-            if name and email:
-                return {"handle": name, "email": email}
-            return None
         except (subprocess.CalledProcessError, FileNotFoundError):
             return None
+        lines = result.stdout.splitlines()
+        if len(lines) < 2:
+            return None
+        # --git-common-dir may be relative to cwd
+        return Path(lines[0]).resolve(), (cwd / lines[1]).resolve()
 
     @staticmethod
     def get_prefer_git_identity(db_path: Optional[Path] = None) -> Optional[bool]:
@@ -1957,23 +2121,15 @@ class DatabaseDiscovery:
             False if prefer_git_identity is explicitly disabled (use config identity silently).
             None if prefer_git_identity is not set at any level (fall through to flags/error).
         """
-        config = DatabaseDiscovery.get_user_config()
+        config = DatabaseDiscovery._get_user_config_raw()
         
         # Check library-level setting first
         if db_path is not None:
-            db_path_resolved = Path(db_path).resolve()
-            libraries = config.get("libraries", {})
-            
-            for alias, lib_config in libraries.items():
-                lib_path = Path(lib_config.get("path", ""))
-                try:
-                    lib_path = lib_path.resolve()
-                except Exception:
-                    continue
-                if lib_path == db_path_resolved:
-                    if "prefer_git_identity" in lib_config:
-                        return bool(lib_config["prefer_git_identity"])
-                    break
+            alias = DatabaseDiscovery.find_library_alias(db_path, config=config)
+            if alias is not None:
+                lib_config = config["libraries"][alias]
+                if "prefer_git_identity" in lib_config:
+                    return bool(lib_config["prefer_git_identity"])
         
         # Check global-level setting
         global_user = config.get("user", {})
@@ -1987,7 +2143,21 @@ class DatabaseDiscovery:
     # =========================================================================
 
     @staticmethod
-    def _resolve_location_value(value: str, config: Optional[dict] = None) -> Path:
+    def _resolve_path(raw: str, cache: Optional[Dict[str, Path]] = None) -> Path:
+        """Return Path(raw).resolve(), memoized in cache (keyed by raw string) if given."""
+        if cache is None:
+            return Path(raw).resolve()
+        path = cache.get(raw)
+        if path is None:
+            path = cache[raw] = Path(raw).resolve()
+        return path
+
+    @staticmethod
+    def _resolve_location_value(
+        value: str,
+        config: Optional[dict] = None,
+        resolved_paths: Optional[Dict[str, Path]] = None,
+    ) -> Path:
         """
         Resolve a [locations] value to a filesystem path.
         
@@ -1999,6 +2169,7 @@ class DatabaseDiscovery:
         Args:
             value: The raw value string from [locations]
             config: Optional pre-loaded config dict (avoids re-reading). If None, loads config.
+            resolved_paths: Optional memo of raw path string -> resolved Path
         
         Returns:
             Resolved Path
@@ -2007,7 +2178,7 @@ class DatabaseDiscovery:
             ValueError: If format is invalid or alias doesn't exist
         """
         if value.startswith('/'):
-            return Path(value).resolve()
+            return DatabaseDiscovery._resolve_path(value, resolved_paths)
         
         if '/' in value:
             raise ValueError(
@@ -2033,7 +2204,7 @@ class DatabaseDiscovery:
                 f"Library alias '{value}' has no 'path' defined."
             )
         
-        return Path(lib_path).resolve()
+        return DatabaseDiscovery._resolve_path(lib_path, resolved_paths)
 
     @staticmethod
     def resolve_alias(alias: str) -> Path:
@@ -2111,18 +2282,14 @@ class DatabaseDiscovery:
         
         # Check library overrides if we have a db_path
         if db_path is not None:
-            db_path_resolved = Path(db_path).resolve()
-            libraries = config.get("libraries", {})
-            
-            for alias, lib_config in libraries.items():
-                lib_path = Path(lib_config["path"]).resolve()
-                if lib_path == db_path_resolved:
-                    # Found matching library — apply overrides
-                    if "handle" in lib_config:
-                        effective["handle"] = lib_config["handle"]
-                    if "email" in lib_config:
-                        effective["email"] = lib_config["email"]
-                    break
+            alias = DatabaseDiscovery.find_library_alias(db_path, config=config)
+            if alias is not None:
+                # Found matching library — apply overrides
+                lib_config = config["libraries"][alias]
+                if "handle" in lib_config:
+                    effective["handle"] = lib_config["handle"]
+                if "email" in lib_config:
+                    effective["email"] = lib_config["email"]
 
         # Validate we have both required fields
         if not effective.get("handle") or not effective.get("email"):
@@ -2135,6 +2302,38 @@ class DatabaseDiscovery:
         
         return effective
 
+    @staticmethod
+    def find_library_alias(db_path: Path, config: Optional[dict] = None) -> Optional[str]:
+        """
+        Return the [libraries] alias whose path resolves to db_path, if any.
+
+        Library paths are resolved once per loaded user config (the cached
+        config object is reused until user.toml changes), so each call costs
+        one resolve() of db_path and a dict lookup. The first matching alias
+        wins; entries whose path cannot be resolved are ignored.
+
+        Args:
+            db_path: Path to the .aver database directory
+            config: Optional pre-loaded user config. If None, loads config.
+        """
+        if config is None:
+            config = DatabaseDiscovery.get_user_config()
+        cached = DatabaseDiscovery._library_path_index
+        if cached is not None and cached[0] is config:
+            index = cached[1]
+        else:
+            index = {}
+            for alias, lib_config in config.get("libraries", {}).items():
+                try:
+                    lib_path = Path(lib_config["path"]).resolve()
+                except Exception:
+                    continue
+                index.setdefault(lib_path, alias)
+            DatabaseDiscovery._library_path_index = (config, index)
+        if not index:
+            return None
+        return index.get(Path(db_path).resolve())
+
     @staticmethod
     def get_all_aliases() -> dict:
         """
@@ -2143,7 +2342,7 @@ class DatabaseDiscovery:
         Returns:
             Dict mapping alias -> {path, handle (optional), email (optional)}
         """
-        config = DatabaseDiscovery.get_user_config()
+        config = DatabaseDiscovery._get_user_config_raw()
         return dict(config.get("libraries", {}))
 
     # =========================================================================
@@ -2180,14 +2379,8 @@ class DatabaseDiscovery:
             return candidates
         
         # 2) Git repository (contextually relevant)
-        try:
-            result = subprocess.run(
-                ["git", "rev-parse", "--show-toplevel"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            repo_root = Path(result.stdout.strip()).resolve()
+        repo_root = DatabaseDiscovery.get_git_repo_root(cwd)
+        if repo_root is not None:
             candidate = repo_root / ".aver"
             if candidate.exists():
                 candidates['git_repo'] = {
@@ -2195,14 +2388,12 @@ class DatabaseDiscovery:
                     'source': f'Git repo: {repo_root}',
                     'category': 'contextual',
                 }
-        except subprocess.CalledProcessError:
-            pass
     
         # 3) User config [locations] matching CWD (contextually relevant)
         matched_location = None
         user_db = DatabaseDiscovery.lookup_user_locations(cwd)
         if user_db:
-            matched_location = user_db.resolve()
+            matched_location = user_db  # already resolved
             candidates['user_locations_matched'] = {
                 'path': matched_location,
                 'source': f'User config [locations] (matched): {user_db}',
@@ -2210,64 +2401,63 @@ class DatabaseDiscovery:
             }
     
         # 4) Parent directory traversal (contextually relevant)
-        current = cwd
-        while True:
-            candidate = current / ".aver"
-            if candidate.exists():
-                candidates['parent_dir'] = {
-                    'path': candidate.resolve(),
-                    'source': f'Parent directory: {current}',
-                    'category': 'contextual',
-                }
-                break
-            if current.parent == current:
-                break
-            current = current.parent
+        found = DatabaseDiscovery.find_parent_database(cwd)
+        if found is not None:
+            parent_dir, candidate = found
+            candidates['parent_dir'] = {
+                'path': candidate,
+                'source': f'Parent directory: {parent_dir}',
+                'category': 'contextual',
+            }
     
-        # 5) All other user config [locations] entries (secondary options)
+        # Paths already offered, for O(1) duplicate checks below; resolve()
+        # results are shared between [locations] and [libraries] lookups.
+        seen_paths = {c['path'] for c in candidates.values()}
+        resolved_paths: Dict[str, Path] = {}
+    
+        # 5) + 6) Secondary options: all other user config [locations]
+        # entries, then library aliases. Both are gathered into one list and
+        # deduplicated against everything offered so far in a single pass.
         user_config = DatabaseDiscovery.get_user_config()
-        if 'locations' in user_config:
-            for path_prefix, db_path_raw in user_config['locations'].items():
+        pending = []  # (candidate key, location prefix or None for alias, raw value, source)
+        for path_prefix, db_path_raw in user_config.get('locations', {}).items():
+            pending.append((
+                f"user_locations_{path_prefix.replace('/', '_')}",
+                path_prefix,
+                db_path_raw,
+                f'User config [locations]: {path_prefix} → {db_path_raw}',
+            ))
+        for alias, lib_config in user_config.get("libraries", {}).items():
+            pending.append((
+                f"library_alias_{alias}",
+                None,
+                lib_config["path"],
+                f'Library alias: {alias} → {lib_config["path"]}',
+            ))
+        
+        for key, path_prefix, raw_value, source in pending:
+            if path_prefix is None:
+                db_path_obj = DatabaseDiscovery._resolve_path(raw_value, resolved_paths)
+            else:
                 try:
                     db_path_obj = DatabaseDiscovery._resolve_location_value(
-                        db_path_raw, config=user_config
+                        raw_value, config=user_config, resolved_paths=resolved_paths
                     )
                 except ValueError as e:
                     # Skip invalid entries with a warning (don't crash discovery)
-                    print(f"Warning: Skipping [locations] entry '{path_prefix}': {e}", file=sys.stderr)
+                    DatabaseDiscovery._warn_invalid_location(path_prefix, raw_value, e)
                     continue
-                
-                # Skip if already added (matched location or parent)
-                if db_path_obj == matched_location or any(
-                    c['path'] == db_path_obj for c in candidates.values()
-                ):
-                    continue
-                
-                # Only add if it exists
-                if db_path_obj.exists():
-                    key = f"user_locations_{path_prefix.replace('/', '_')}"
-                    candidates[key] = {
-                        'path': db_path_obj,
-                        'source': f'User config [locations]: {path_prefix} → {db_path_raw}',
-                        'category': 'available',
-                    }
-    
-        # 6) Library aliases (secondary options, skip duplicates)
-        libraries = user_config.get("libraries", {})
-        for alias, lib_config in libraries.items():
-            lib_path = Path(lib_config["path"]).resolve()
             
-            # Skip if already present from another discovery method
-            if any(c['path'] == lib_path for c in candidates.values()):
+            # Skip if already present from another discovery method; only
+            # offer paths that exist
+            if db_path_obj in seen_paths or not db_path_obj.exists():
                 continue
-            
-            if lib_path.exists():
-                key = f"library_alias_{alias}"
-                candidates[key] = {
-                    'path': lib_path,
-                    'source': f'Library alias: {alias} → {lib_config["path"]}',
-                    'category': 'available',
-                }
+            candidates[key] = {
+                'path': db_path_obj,
+                'source': source,
+                'category': 'available',
+            }
+            seen_paths.add(db_path_obj)
     
         return candidates
 
@@ -2369,13 +2559,43 @@ class DatabaseDiscovery:
         raise RuntimeError("No suitable incident database found")
  
 
+    @staticmethod
+    def find_parent_database(cwd: Path) -> Optional[tuple]:
+        """
+        Find the closest .aver directory at or above cwd.
+
+        One stat per ancestor until the first hit; the answer is cached per
+        cwd for the life of the process, so repeated discovery calls do no
+        filesystem work.
+
+        Returns:
+            (directory containing .aver, resolved .aver path), or None
+        """
+        cache = DatabaseDiscovery._parent_database_cache
+        if cwd in cache:
+            return cache[cwd]
+        # Walk with plain strings; Paths are only built for the winner.
+        found = None
+        current = os.fspath(cwd)
+        while True:
+            candidate = os.path.join(current, ".aver")
+            if os.path.exists(candidate):
+                found = (Path(current), Path(candidate).resolve())
+                break
+            parent = os.path.dirname(current)
+            if parent == current:
+                break
+            current = parent
+        cache[cwd] = found
+        return found
+
     @staticmethod
     def lookup_user_locations(cwd: Path) -> Optional[Path]:
         """
         Check user-configured locations mapping for the current working directory.
 
         Longest matching parent key is used.
-        Returns the mapped path if found, else None.
+        Returns the resolved mapped path if found, else None.
 
         Location values can be:
         - Absolute paths: "/path/to/.aver"
@@ -2390,24 +2610,61 @@ class DatabaseDiscovery:
         locations = config.get('locations', {})
         if not locations:
             return None
-        cwd_resolved = cwd.resolve()
+        index, roots, resolved_paths = DatabaseDiscovery._get_locations_index(config, locations)
 
-        matches = []
-        for key, value in locations.items():
-            if cwd_resolved.is_relative_to(Path(key).resolve()):  # Python 3.9+
-                try:
-                    resolved = DatabaseDiscovery._resolve_location_value(value, config=config)
-                    matches.append((Path(key).resolve(), resolved))
-                except ValueError as e:
-                    print(f"Warning: Skipping [locations] entry '{key}': {e}", file=sys.stderr)
-                    continue
-
-        if not matches:
+        # Walk cwd's ancestors from deepest to shallowest: the first key hit
+        # is the longest matching prefix (most specific parent). If cwd's
+        # top-level directory isn't the start of any key, nothing can match.
+        parts = cwd.resolve().parts
+        if roots is not None and parts[:2] not in roots:
             return None
+        for depth in range(len(parts), 0, -1):
+            entry = index.get(parts[:depth])
+            if entry is None:
+                continue
+            key, value = entry
+            try:
+                return DatabaseDiscovery._resolve_location_value(
+                    value, config=config, resolved_paths=resolved_paths
+                )
+            except ValueError as e:
+                DatabaseDiscovery._warn_invalid_location(key, value, e)
+
+        return None
+
+    @staticmethod
+    def _warn_invalid_location(key: str, raw_value: str, error: Exception):
+        """Warn about an invalid [locations] entry, once per (key, value) per process."""
+        marker = (key, raw_value)
+        if marker in DatabaseDiscovery._warned_locations:
+            return
+        DatabaseDiscovery._warned_locations.add(marker)
+        print(f"Warning: Skipping [locations] entry '{key}': {error}", file=sys.stderr)
+
+    @staticmethod
+    def _get_locations_index(config: dict, locations: dict) -> tuple:
+        """
+        Map resolved [locations] key path parts -> (key, value).
+
+        Built once per loaded user config (the cached config object is reused
+        until user.toml changes), so lookups are one dict probe per ancestor.
 
-        # Pick the longest matching prefix (most specific parent)
-        longest_match = max(matches, key=lambda t: len(str(t[0])))
-        return longest_match[1]
+        Returns (index, roots, resolved_paths): roots is the frozenset of every
+        key's anchor plus first component (e.g. ('/', 'home')), or None if some
+        key is a bare filesystem root and so matches everywhere;
+        resolved_paths memoizes resolved location values for the same config.
+        """
+        cached = DatabaseDiscovery._locations_index
+        if cached is not None and cached[0] is config:
+            return cached[1:]
+        index = {}
+        for key, value in locations.items():
+            index.setdefault(Path(key).resolve().parts, (key, value))
+        roots = None
+        if all(len(parts) > 1 for parts in index):
+            roots = frozenset(parts[:2] for parts in index)
+        DatabaseDiscovery._locations_index = (config, index, roots, {})
+        return DatabaseDiscovery._locations_index[1:]
 
     @staticmethod
     def find_database(explicit_location: Optional[Path] = None, verbose: bool = False) -> Optional[Path]:
@@ -2438,40 +2695,28 @@ class DatabaseDiscovery:
             return db_path
 
         # 2) Git repository detection
-        try:
-            result = subprocess.run(
-                ["git", "rev-parse", "--show-toplevel"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            repo_root = Path(result.stdout.strip()).resolve()
+        repo_root = DatabaseDiscovery.get_git_repo_root(cwd)
+        if repo_root is not None:
             candidate = repo_root / ".aver"
             if candidate.exists():
                 if verbose:
                     print(f"[DatabaseDiscovery] Using git repo location: {candidate}")
                 return candidate
-        except subprocess.CalledProcessError:
-            pass
 
         # 3) User config [locations] lookup
         user_db = DatabaseDiscovery.lookup_user_locations(cwd)
         if user_db:
             if verbose:
                 print(f"[DatabaseDiscovery] Using user-config location: {user_db}")
-            return user_db.resolve()
+            return user_db  # already resolved
 
         # 4) Parent directory search
-        current = cwd
-        while True:
-            candidate = current / ".aver"
-            if candidate.exists():
-                if verbose:
-                    print(f"[DatabaseDiscovery] Using parent directory location: {candidate}")
-                return candidate.resolve()
-            if current.parent == current:
-                break
-            current = current.parent
+        found = DatabaseDiscovery.find_parent_database(cwd)
+        if found is not None:
+            parent_dir, candidate = found
+            if verbose:
+                print(f"[DatabaseDiscovery] Using parent directory location: {parent_dir / '.aver'}")
+            return candidate
 
         # 5) Not found
         if verbose:
@@ -2499,28 +2744,16 @@ class DatabaseDiscovery:
             True if check passes (not in repo, or db is in repo, or override is set)
             False if check fails (in repo, but db is outside repo)
         """
-        try:
-            result = subprocess.run(
-                ["git", "rev-parse", "--show-toplevel"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            repo_root = Path(result.stdout.strip()).resolve()
-            db_resolved = db_root.resolve()
-        
-            # Check if db_root is within repo_root
-            try:
-                db_resolved.relative_to(repo_root)
-                return True  # db is within repo
-            except ValueError:
-                # db is NOT within repo
-                if override:
-                    return True
-                return False
-        except subprocess.CalledProcessError:
+        if override:
+            return True
+        repo_root = DatabaseDiscovery.get_git_repo_root()
+        if repo_root is None:
             # Not in a git repo, so check doesn't apply
             return True
+    
+        # Check if db_root is within repo_root (db_root may be relative, as
+        # given to 'admin init --location', so it is still resolved here)
+        return db_root.resolve().is_relative_to(repo_root)
 
 
 # ============================================================================
@@ -2540,7 +2773,7 @@ class EditorConfig:
         3. System defaults (vim, nano, vi, emacs)
         """
         # Check user config
-        user_config = DatabaseDiscovery.get_user_config()
+        user_config = DatabaseDiscovery._get_user_config_raw()
         if "editor" in user_config:
             return user_config["editor"]
 
@@ -2559,22 +2792,33 @@ class EditorConfig:
             "  incident config set-editor <editor>"
         )
 
+    @staticmethod
+    def get_temp_dir() -> Optional[str]:
+        """
+        Get the directory for editor temp files.
+
+        AVER_EDITOR_TMPDIR if set, else None (tempfile's default: $TMPDIR or
+        the system temp dir). Edited content is parsed in memory and only
+        persisted by the storage layer, so the temp file never needs to live
+        next to the project.
+        """
+        return os.environ.get("AVER_EDITOR_TMPDIR") or None
+
     @staticmethod
     def _editor_exists(editor_name: str) -> bool:
         """Check if editor is available in PATH."""
-        result = subprocess.run(
-            ["which", editor_name],
-            capture_output=True,
-        )
-        return result.returncode == 0
+        return shutil.which(editor_name) is not None
 
     @staticmethod
-    def launch_editor(initial_content: str = "") -> str:
+    def launch_editor(initial_content: str = "", temp_path: Optional[str] = None) -> str:
         """
         Launch editor for user input.
 
         Args:
             initial_content: Pre-fill editor with this content
+            temp_path: Existing file to edit in, overwritten with
+                initial_content; the caller owns it and removes it. If None,
+                a temp file is created and removed here.
 
         Returns:
             User-edited content
@@ -2584,14 +2828,21 @@ class EditorConfig:
         """
         editor = EditorConfig.get_editor()
 
-        # Create temp file
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            suffix=".txt",
-            delete=False,
-        ) as f:
-            temp_file = f.name
-            if initial_content:
+        if temp_path is None:
+            # Create temp file
+            with tempfile.NamedTemporaryFile(
+                mode="w",
+                suffix=".txt",
+                delete=False,
+                dir=EditorConfig.get_temp_dir(),
+            ) as f:
+                temp_file = f.name
+                if initial_content:
+                    f.write(initial_content)
+        else:
+            # Reuse the caller's file, truncating it in place
+            temp_file = temp_path
+            with open(temp_file, "w") as f:
                 f.write(initial_content)
 
         try:
@@ -2615,10 +2866,11 @@ class EditorConfig:
 
         finally:
             # Clean up
-            try:
-                os.unlink(temp_file)
-            except:
-                pass
+            if temp_path is None:
+                try:
+                    os.unlink(temp_file)
+                except:
+                    pass
 
 
 # ============================================================================
@@ -2629,6 +2881,12 @@ class EditorConfig:
 class StdinHandler:
     """Handle reading from STDIN with detection."""
 
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def stdin_is_tty() -> bool:
+        """Return whether STDIN is an interactive terminal (checked once per process)."""
+        return sys.stdin.isatty()
+
     @staticmethod
     def has_stdin_data() -> bool:
         """
@@ -2638,7 +2896,7 @@ class StdinHandler:
             True if STDIN has data ready to read
         """
         # Check if we're in a TTY (interactive terminal)
-        if sys.stdin.isatty():
+        if StdinHandler.stdin_is_tty():
             return False
 
         # Use select to check for available data (Unix/Linux/macOS)
@@ -2646,8 +2904,8 @@ class StdinHandler:
             ready, _, _ = select.select([sys.stdin], [], [], 0)
             return bool(ready)
         except Exception:
-            # Fallback: on Windows or if select fails
-            return not sys.stdin.isatty()
+            # Fallback: on Windows or if select fails (not a TTY, per above)
+            return True
 
     @staticmethod
     def read_stdin_with_timeout(timeout: float = 2.0) -> Optional[str]:
@@ -2663,7 +2921,7 @@ class StdinHandler:
         Raises:
             RuntimeError: If STDIN read fails
         """
-        if sys.stdin.isatty():
+        if StdinHandler.stdin_is_tty():
             return None
 
         try:
@@ -2683,6 +2941,19 @@ class StdinHandler:
 # Key-Value Store Support
 # ============================================================================
 
+# translate() table deleting every character allowed in keys and custom IDs
+# (A-Z, a-z, 0-9, underscore, hyphen): a string is valid iff nothing remains.
+_KEY_CHARS_DELETION = str.maketrans("", "", string.ascii_letters + string.digits + "_-")
+
+# Type suffixes a KV key may carry (key__string etc.); none contains "__"
+# after its leading underscores, so a suffixed key's base is everything
+# before its last "__".
+_TYPE_SUFFIXES = ('__string', '__integer', '__float')
+
+# Rule line framing the interactive error/warning banners on stderr
+_BANNER_RULE = "=" * 70
+
+
 class KVParser:
     """Parse and validate key-value format strings."""
     
@@ -2692,6 +2963,16 @@ class KVParser:
     TYPE_FLOAT = '%'
     VALID_OPERATORS = {TYPE_STRING, TYPE_INTEGER, TYPE_FLOAT}
     
+    # (valid_key)(first operator)(rest); valid key: alphanumeric, underscore,
+    # hyphen. Operators are escaped in case any are regex special chars.
+    _KV_PATTERN = re.compile(
+        rf'^([a-zA-Z0-9_-]+)({"|".join(re.escape(op) for op in VALID_OPERATORS)})(.*)$'
+    )
+    # Any operator immediately followed by a dash
+    _OP_DASH_PATTERN = re.compile(
+        rf'({"|".join(re.escape(op) for op in VALID_OPERATORS)})-'
+    )
+    
     @staticmethod
     def parse_kv_string(kv_str: str) -> tuple:
         """
@@ -2721,6 +3002,20 @@ class KVParser:
         
         kv_str = kv_str.strip()
         
+        # Fast path for the common plain 'key=value' string: exactly the
+        # inputs the general path below would accept as a '=' addition
+        if (
+            '=' in kv_str
+            and '#' not in kv_str
+            and '%' not in kv_str
+            and '=-' not in kv_str
+            and '\n' not in kv_str
+            and not kv_str.endswith('-')
+        ):
+            key, _, value_str = kv_str.partition('=')
+            if value_str and KVParser._is_valid_key(key):
+                return (key, KVParser.TYPE_STRING, '+', value_str)
+        
         # Pre-validation: check string is not empty after stripping
         if not kv_str:
             raise ValueError("Key-value string cannot be empty")
@@ -2730,9 +3025,9 @@ class KVParser:
             raise ValueError(f"Key-value string cannot start with operator '{kv_str[0]}'")
         
         # Pre-validation: check for operator immediately followed by dash (invalid pattern)
-        for kvtype in KVParser.VALID_OPERATORS:
-            if kvtype + '-' in kv_str:
-                raise ValueError(f"Invalid pattern '{kvtype}-': operator cannot be immediately followed by dash")
+        op_dash = KVParser._OP_DASH_PATTERN.search(kv_str)
+        if op_dash:
+            raise ValueError(f"Invalid pattern '{op_dash.group()}': operator cannot be immediately followed by dash")
         
         # Check for removal format: key- or key${value}-
         if kv_str.endswith('-'):
@@ -2746,16 +3041,7 @@ class KVParser:
             is_removal = False
         
         # Use regex to find the FIRST operator after a valid key
-        # Pattern: (valid_key)(operator)(rest)
-        # Valid key: alphanumeric, underscore, hyphen
-        # Build operator pattern dynamically from VALID_OPERATORS
-        import re
-        
-        # Escape operators for regex (in case any are regex special chars)
-        escaped_ops = [re.escape(op) for op in KVParser.VALID_OPERATORS]
-        ops_pattern = '|'.join(escaped_ops)
-        pattern = rf'^([a-zA-Z0-9_-]+)({ops_pattern})(.*)$'
-        match = re.match(pattern, kv_str.strip())
+        match = KVParser._KV_PATTERN.match(kv_str.strip())
          
         if match:
             key = match.group(1)
@@ -2849,7 +3135,7 @@ class KVParser:
             return False
         # Allow alphanumeric, underscores, and hyphens
         # return all(c.isalnum() or c in ('_', '-') for c in key)
-        return bool(re.match(r'^[a-zA-Z0-9_-]+$', key))
+        return not key.translate(_KEY_CHARS_DELETION)
     
     @staticmethod
     def parse_kv_list(kv_list: List[str]) -> List[tuple]:
@@ -2865,6 +3151,15 @@ class KVSearchParser:
     
     VALID_OPERATORS = {'<', '>', '=', '<=', '>=', '^'}
 
+    # Operators in match priority (check longer ones first).
+    # NOTE: If you add more, make sure none of the PREVIOUS
+    #       items in the list will match.
+    # ^ must come first: its value may contain | but no other operator chars
+    _OPERATOR_PRIORITY = ('^', '<=', '>=', '!=', '<>', '=', '<', '>')
+    # Leftmost comparison operator, and any comparison char after it
+    _FIRST_OP_RE = re.compile(r'<=|>=|!=|<>|=|<|>')
+    _OP_CHAR_RE = re.compile(r'[<>=]')
+
     @staticmethod
     def parse_ksearch(search_expr: str) -> tuple:
         """
@@ -2890,21 +3185,34 @@ class KVSearchParser:
         """
         search_expr = search_expr.strip()
 
-        # Try to find operators (check longer ones first)
-        # NOTE: If you add more, make sure none of the PREVIOUS
-        #       items in the list will match.
-        # ^ must come first: its value may contain | but no other operator chars
-        for op in ['^', '<=', '>=', '!=', '<>', '=', '<', '>']:
+        # Fast path: a single comparison operator (the usual case) is found
+        # in one scan. With '^' or several operator chars present, fall back
+        # to the priority scan so the chosen operator is unchanged.
+        match = None
+        if '^' not in search_expr:
+            match = KVSearchParser._FIRST_OP_RE.search(search_expr)
+            if match and KVSearchParser._OP_CHAR_RE.search(search_expr, match.end()):
+                match = None
+        if match:
+            key = search_expr[:match.start()].strip()
+            op = match.group()
+            value_str = search_expr[match.end():].strip()
+
+            if not key or not value_str:
+                raise ValueError(f"Invalid search format: '{search_expr}'")
+
+            return (key, op, value_str)
+
+        for op in KVSearchParser._OPERATOR_PRIORITY:
             if op in search_expr:
-                parts = search_expr.split(op, 1)
-                if len(parts) == 2:
-                    key = parts[0].strip()
-                    value_str = parts[1].strip()
+                key, _, value_str = search_expr.partition(op)
+                key = key.strip()
+                value_str = value_str.strip()
 
-                    if not key or not value_str:
-                        raise ValueError(f"Invalid search format: '{search_expr}'")
+                if not key or not value_str:
+                    raise ValueError(f"Invalid search format: '{search_expr}'")
 
-                    return (key, op, value_str)
+                return (key, op, value_str)
 
         raise ValueError(
             f"Invalid ksearch format: '{search_expr}'\n"
@@ -2965,6 +3273,10 @@ class KVSearchParser:
 class IncidentFileStorage:
     """Store incidents as Markdown files."""
 
+    # Below this many update files, reading them serially beats starting
+    # a thread pool.
+    PARALLEL_READ_THRESHOLD = 8
+
     def __init__(self, storage_root: Path):
         """Initialize file storage.
         
@@ -2974,27 +3286,49 @@ class IncidentFileStorage:
         self.storage_root = storage_root
         self.incidents_dir = storage_root / "records"
         self.updates_dir = storage_root / "updates"
+        # incident_id -> (st_mtime_ns, st_size, template_id); see _get_template_id()
+        self._template_id_cache: Dict[str, tuple] = {}
+        # Incident IDs whose updates directory is known to exist
+        self._ensured_updates_dirs: set = set()
         
         # Create directories
         self.incidents_dir.mkdir(parents=True, exist_ok=True)
         self.updates_dir.mkdir(parents=True, exist_ok=True)
 
+    @staticmethod
+    def _write_file(path: Path, content: str):
+        """Write content as UTF-8 with raw os-level calls (no text/buffer layers)."""
+        data = memoryview(content.encode("utf-8"))
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        fd = os.open(path, flags, 0o666)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+
     def _get_incident_path(self, incident_id: str) -> Path:
         """Get file path for incident."""
         return self.incidents_dir / f"{incident_id}.md"
 
     def _get_updates_dir(self, incident_id: str) -> Path:
-        """Get directory path for incident updates."""
+        """Get directory path for incident updates (may not exist yet)."""
+        return self.updates_dir / incident_id
+
+    def _ensure_updates_dir(self, incident_id: str) -> Path:
+        """Get directory path for incident updates, creating it on first use."""
         updates_dir = self.updates_dir / incident_id
-        updates_dir.mkdir(parents=True, exist_ok=True)
+        if incident_id not in self._ensured_updates_dirs:
+            updates_dir.mkdir(parents=True, exist_ok=True)
+            self._ensured_updates_dirs.add(incident_id)
         return updates_dir
             
     def save_incident(self, incident: Incident, project_config: ProjectConfig) -> str:
         """Save incident to Markdown file. Returns the content written."""
         path = self._get_incident_path(incident.id)
         content = incident.to_markdown(project_config)
-        with open(path, "w") as f:
-            f.write(content)
+        self._write_file(path, content)
+        self._template_id_cache.pop(incident.id, None)
         return content
     
     def load_incident(
@@ -3009,8 +3343,7 @@ class IncidentFileStorage:
             return None
         
         try:
-            with open(path, "r") as f:
-                content = f.read()
+            content = path.read_text(encoding="utf-8")
             return Incident.from_markdown(content, incident_id, project_config)
         except Exception as e:
             print(f"Warning: Failed to load incident {incident_id}: path: {path} {e}", file=sys.stderr)
@@ -3021,12 +3354,12 @@ class IncidentFileStorage:
         path = self._get_incident_path(incident_id)
         if path.exists():
             path.unlink()
+        self._template_id_cache.pop(incident_id, None)
 
     def list_incident_files(self) -> List[str]:
         """List all incident IDs from files."""
-        incident_ids = []
-        for file_path in self.incidents_dir.glob("*.md"):
-            incident_ids.append(file_path.stem)
+        with os.scandir(self.incidents_dir) as entries:
+            incident_ids = [entry.name[:-3] for entry in entries if entry.name.endswith(".md")]
         return sorted(incident_ids)
 
     def save_update(self, incident_id: str, update: IncidentUpdate, project_config: Optional['ProjectConfig'] = None) -> str:
@@ -3038,39 +3371,91 @@ class IncidentFileStorage:
             update: IncidentUpdate to save (should have template_id set if using templates)
             project_config: ProjectConfig for special fields (optional)
         """
-        updates_dir = self._get_updates_dir(incident_id)
+        updates_dir = self._ensure_updates_dir(incident_id)
         filename = IDGenerator.generate_update_filename(update.id)
         update_file = updates_dir / filename
 
         # Get parent incident's template_id to pass to to_markdown
         parent_template_id = None
         if project_config:
-            incident = self.load_incident(incident_id, project_config)
-            if incident and incident.kv_strings and 'template_id' in incident.kv_strings:
-                parent_template_id = incident.kv_strings['template_id'][0]
+            parent_template_id = self._get_template_id(incident_id, project_config)
         
         content = update.to_markdown(project_config, parent_template_id=parent_template_id)
-        update_file.write_text(content)
+        self._write_file(update_file, content)
         return content
     
 
-    def load_updates(self, incident_id: str) -> List[IncidentUpdate]:
-        """Load all updates for incident."""
+    def _get_template_id(self, incident_id: str, project_config: 'ProjectConfig') -> Optional[str]:
+        """
+        Return the incident's template_id, or None.
+
+        Cached per incident while its file's mtime and size are unchanged, so
+        saving many updates to one incident parses it only once.
+        """
+        path = self._get_incident_path(incident_id)
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        cached = self._template_id_cache.get(incident_id)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        
+        template_id = None
+        incident = self.load_incident(incident_id, project_config)
+        if incident and incident.kv_strings and 'template_id' in incident.kv_strings:
+            template_id = incident.kv_strings['template_id'][0]
+        if incident is not None:
+            self._template_id_cache[incident_id] = (st.st_mtime_ns, st.st_size, template_id)
+        return template_id
+
+    def load_updates(self, incident_id: str, parallel: bool = True) -> List[IncidentUpdate]:
+        """
+        Load all updates for incident.
+
+        Args:
+            incident_id: Record whose updates to load
+            parallel: Allow reading long histories on a thread pool; pass
+                False when already running on a pool worker
+        """
         updates_dir = self._get_updates_dir(incident_id)
         updates = []
     
-        for update_file in sorted(updates_dir.glob("*.md")):
+        try:
+            with os.scandir(updates_dir) as entries:
+                filenames = sorted(entry.name for entry in entries if entry.name.endswith(".md"))
+        except FileNotFoundError:
+            return updates  # no notes saved yet
+        update_files = [updates_dir / filename for filename in filenames]
+    
+        # File reads are overlapped across threads for long histories;
+        # parsing stays serial, in filename order, so warnings stay ordered.
+        if not parallel or len(update_files) < self.PARALLEL_READ_THRESHOLD:
+            contents = map(self._read_update_file, update_files)
+        else:
+            max_workers = min(16, (os.cpu_count() or 1) * 2)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                contents = list(executor.map(self._read_update_file, update_files))
+    
+        for update_file, content in zip(update_files, contents):
             try:
-                update_id = update_file.stem
-                with open(update_file, "r") as f:
-                    content = f.read()
-            
+                if isinstance(content, Exception):
+                    raise content
+                update_id = update_file.name[:-3]
                 update = IncidentUpdate.from_markdown(content, update_id, incident_id)
                 updates.append(update)
             except Exception as e:
                 print(f"Warning: Failed to load update {update_file}: {e}", file=sys.stderr)
     
         return updates
+
+    @staticmethod
+    def _read_update_file(update_file: Path) -> Union[str, Exception]:
+        """Read one update file, returning the error instead of raising it."""
+        try:
+            return update_file.read_text(encoding="utf-8")
+        except Exception as e:
+            return e
         
     def validate_custom_id(custom_id: str) -> bool:
         """
@@ -3084,8 +3469,7 @@ class IncidentFileStorage:
         Returns:
             True if valid, False otherwise
         """
-        pattern = r'^[A-Za-z0-9_-]+$'
-        return bool(re.match(pattern, custom_id))
+        return bool(custom_id) and not custom_id.translate(_KEY_CHARS_DELETION)
  
 # ============================================================================
 # Index Database (OPTIMIZED - Single KV Table, Flat Keyspace)
@@ -3094,14 +3478,72 @@ class IncidentFileStorage:
 class IncidentIndexDatabase:
     """SQLite-based index for incidents (search and filtering only)."""
 
+    # Applied to every connection. The index is a rebuildable cache, so WAL
+    # with synchronous=NORMAL trades nothing of value for cheaper commits.
+    CONNECTION_PRAGMAS = (
+        "journal_mode=WAL",
+        "synchronous=NORMAL",
+        "temp_store=MEMORY",
+        "mmap_size=268435456",
+        "cache_size=-65536",
+    )
+
+    # kv_store value column for each of (strings, integers, floats, secure)
+    KV_VALUE_COLUMNS = ("value_string", "value_integer", "value_float", "value_secure")
+
+    # Whitelist of operators search_kv() accepts (they are formatted into SQL)
+    SEARCH_OPERATORS = frozenset({'=', '<', '>', '<=', '>=', "<>", "!=", "^"})
+
+    # One fixed INSERT string per value column, so repeated inserts hit the
+    # connection's statement cache instead of being formatted and re-parsed
+    KV_INSERT_SQL = {
+        column: f"""INSERT INTO kv_store
+                   (incident_id, update_id, key, {column}, created_at)
+                   VALUES (?, ?, ?, ?, ?)"""
+        for column in KV_VALUE_COLUMNS
+    }
+
+    # fts_source's delete trigger; clear_index drops and recreates it
+    FTS_SOURCE_DELETE_TRIGGER_SQL = """
+        CREATE TRIGGER IF NOT EXISTS fts_source_ad AFTER DELETE ON fts_source BEGIN
+            INSERT INTO incidents_fts (incidents_fts, rowid, incident_id, source, source_id, content)
+            VALUES ('delete', old.rowid, old.incident_id, old.source, old.source_id, old.content);
+        END
+    """
+
+    # Prepared statements kept per connection (sqlite3 defaults to 128; a
+    # search builds a distinct statement per criteria shape)
+    CACHED_STATEMENTS = 512
+
     def __init__(self, database_path: Path):
         self.database_path = database_path
+        self._conn: Optional[sqlite3.Connection] = None
         self._ensure_schema()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """The index's connection, opened on first use and reused for every query."""
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.database_path,
+                check_same_thread=False,
+                cached_statements=self.CACHED_STATEMENTS,
+            )
+            for pragma in self.CONNECTION_PRAGMAS:
+                conn.execute(f"PRAGMA {pragma}")
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        """Close the connection (a later query reopens it)."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
     
     @staticmethod
     def _generate_timestamp() -> str:
-        """Generate ISO 8601 timestamp with Z suffix."""
-        return datetime.datetime.now(datetime.UTC).isoformat().replace("+00:00", "Z")
+        """Generate ISO 8601 timestamp with Z suffix, in IncidentManager._generate_timestamp()'s format."""
+        return datetime.datetime.now(datetime.UTC).isoformat()[:-6] + "Z"
 
     @staticmethod
     def _md5_of_content(content: str) -> str:
@@ -3120,20 +3562,18 @@ class IncidentIndexDatabase:
             mtime_ts = path.stat().st_mtime
             return datetime.datetime.fromtimestamp(
                 mtime_ts, tz=datetime.timezone.utc
-            ).isoformat().replace("+00:00", "Z")
+            ).isoformat()[:-6] + "Z"
         except OSError:
-            return datetime.datetime.now(datetime.UTC).isoformat().replace("+00:00", "Z")
+            return datetime.datetime.now(datetime.UTC).isoformat()[:-6] + "Z"
 
     def _get_file_index_entry(self, file_path: Path) -> Optional[tuple]:
         """Return (file_hash, file_mtime) stored in file_index for *file_path*, or None."""
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         cursor.execute(
             "SELECT file_hash, file_mtime FROM file_index WHERE file_path = ?",
             (str(file_path),),
         )
         row = cursor.fetchone()
-        conn.close()
         return row  # None or (hash, mtime)
 
     def is_file_unchanged(self, file_path: Path, skip_mtime: bool = False) -> bool:
@@ -3167,8 +3607,7 @@ class IncidentIndexDatabase:
 
     def _ensure_schema(self):
         """Create tables if they don't exist, migrating legacy tables as needed."""
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
 
         # ----------------------------------------------------------------
         # incidents_index → file_index migration
@@ -3204,11 +3643,73 @@ class IncidentIndexDatabase:
             "CREATE INDEX IF NOT EXISTS idx_file_index_path ON file_index(file_path)"
         )
 
+        # ----------------------------------------------------------------
         # Full-text search index
+        # incidents_fts is an external-content FTS5 table over fts_source,
+        # which holds one row per record/note. Changing a row deletes just
+        # its own tokens (by rowid) instead of rewriting a content-storing
+        # FTS row. Legacy content-storing tables are migrated in place.
+        # ----------------------------------------------------------------
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS fts_source (
+                rowid       INTEGER PRIMARY KEY,
+                incident_id TEXT,
+                source      TEXT NOT NULL,
+                source_id   TEXT,
+                content     TEXT,
+                UNIQUE (source, source_id)
+            )
+            """
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_fts_source_incident ON fts_source(incident_id)"
+        )
+
+        cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type='table' AND name='incidents_fts'"
+        )
+        row = cursor.fetchone()
+        legacy_fts = row is not None and "content=" not in row[0]
+        if legacy_fts:
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO fts_source (incident_id, source, source_id, content)
+                SELECT incident_id, source, source_id, content FROM incidents_fts
+                """
+            )
+            cursor.execute("DROP TABLE incidents_fts")
+
         cursor.execute(
             """
             CREATE VIRTUAL TABLE IF NOT EXISTS incidents_fts
-            USING fts5(incident_id UNINDEXED, source, source_id UNINDEXED, content)
+            USING fts5(incident_id UNINDEXED, source, source_id UNINDEXED, content,
+                       content='fts_source', content_rowid='rowid')
+            """
+        )
+        if legacy_fts:
+            cursor.execute("INSERT INTO incidents_fts(incidents_fts) VALUES('rebuild')")
+
+        # Triggers keep incidents_fts in step with fts_source, so writers only
+        # ever touch fts_source. An external-content 'delete' must be given
+        # the row's old values, which the triggers always have.
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS fts_source_ai AFTER INSERT ON fts_source BEGIN
+                INSERT INTO incidents_fts (rowid, incident_id, source, source_id, content)
+                VALUES (new.rowid, new.incident_id, new.source, new.source_id, new.content);
+            END
+            """
+        )
+        cursor.execute(self.FTS_SOURCE_DELETE_TRIGGER_SQL)
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS fts_source_au AFTER UPDATE ON fts_source BEGIN
+                INSERT INTO incidents_fts (incidents_fts, rowid, incident_id, source, source_id, content)
+                VALUES ('delete', old.rowid, old.incident_id, old.source, old.source_id, old.content);
+                INSERT INTO incidents_fts (rowid, incident_id, source, source_id, content)
+                VALUES (new.rowid, new.incident_id, new.source, new.source_id, new.content);
+            END
             """
         )
     
@@ -3244,10 +3745,17 @@ class IncidentIndexDatabase:
             ON kv_store(update_id, key)
         """)    
 
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_kv_key
-            ON kv_store(key)
-        """)
+        # Cross-record value lookups (key = ? AND value_<type> = ?) seek
+        # these and read incident_id/update_id from the index itself. Every
+        # lookup by key also filters on a value or on incident_id/update_id,
+        # so the plain idx_kv_key is no longer needed.
+        cursor.execute("DROP INDEX IF EXISTS idx_kv_key")
+        for column in self.KV_VALUE_COLUMNS:
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_kv_key_{column}
+                ON kv_store(key, {column}, incident_id, update_id)
+                WHERE {column} IS NOT NULL
+            """)
     
         # Partial indexes for value searches (only include non-NULL values)
         cursor.execute("""
@@ -3274,8 +3782,7 @@ class IncidentIndexDatabase:
             WHERE value_secure IS NOT NULL
         """)
 
-        conn.commit()
-        conn.close()
+        self.conn.commit()
 
     def index_incident(
         self,
@@ -3294,42 +3801,32 @@ class IncidentIndexDatabase:
             file_content: Raw Markdown content of the file (used for MD5 hash).
                 If omitted, the hash is computed from incident.to_markdown() output.
         """
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
-
-        # -- file_index entry -----------------------------------------------
-        if file_path is not None:
-            rel_path = str(file_path)
-            content_for_hash = file_content if file_content is not None else incident.to_markdown(project_config)
-            file_hash = self._md5_of_content(content_for_hash)
-            file_mtime = self._mtime_of_path(file_path)
-            cursor.execute(
-                """
-                INSERT INTO file_index (file_path, file_hash, file_mtime)
-                VALUES (?, ?, ?)
-                ON CONFLICT(file_path) DO UPDATE SET
-                    file_hash  = excluded.file_hash,
-                    file_mtime = excluded.file_mtime
-                """,
-                (rel_path, file_hash, file_mtime),
-            )
+        with self.conn:
+            cursor = self.conn.cursor()
 
-        # Index FTS for description and other content
-        cursor.execute(
-            "DELETE FROM incidents_fts WHERE incident_id = ? AND source = 'incident'",
-            (incident.id,)
-        )
+            # -- file_index entry -----------------------------------------------
+            if file_path is not None:
+                rel_path = str(file_path)
+                content_for_hash = file_content if file_content is not None else incident.to_markdown(project_config)
+                file_hash = self._md5_of_content(content_for_hash)
+                file_mtime = self._mtime_of_path(file_path)
+                cursor.execute(
+                    """
+                    INSERT INTO file_index (file_path, file_hash, file_mtime)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(file_path) DO UPDATE SET
+                        file_hash  = excluded.file_hash,
+                        file_mtime = excluded.file_mtime
+                    """,
+                    (rel_path, file_hash, file_mtime),
+                )
 
-        # Get title and description from kv_store
-        title = incident.kv_strings.get('title', [''])[0] if incident.kv_strings else ''
-        description = incident.content
-        content = f"{title}\n\n{description}"
-        cursor.execute(
-            "INSERT INTO incidents_fts (incident_id, source, source_id, content) VALUES (?, ?, ?, ?)",
-            (incident.id, "incident", incident.id, content),
-        )
+            # Index FTS for description and other content
+            title = incident.kv_strings.get('title', [''])[0] if incident.kv_strings else ''
+            description = incident.content
+            content = f"{title}\n\n{description}"
+            self._upsert_fts_row(cursor, incident.id, "incident", incident.id, content)
 
-        conn.commit()
 
     def index_update(
         self,
@@ -3345,9 +3842,30 @@ class IncidentIndexDatabase:
                 the actual file mtime is read; if omitted, current time is used.
             file_content: Raw Markdown content (used for MD5 hash).
         """
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
+        with self.conn:
+            self._index_update_rows(self.conn.cursor(), update, file_path, file_content)
+
+    def index_updates(self, updates: List[tuple]):
+        """Index several notes in one transaction.
+
+        Args:
+            updates: (update, file_path) pairs, as for index_update()
+        """
+        if not updates:
+            return
+        with self.conn:
+            cursor = self.conn.cursor()
+            for update, file_path in updates:
+                self._index_update_rows(cursor, update, file_path)
 
+    def _index_update_rows(
+        self,
+        cursor: sqlite3.Cursor,
+        update: IncidentUpdate,
+        file_path: Optional[Path] = None,
+        file_content: Optional[str] = None,
+    ):
+        """Write one note's file_index and FTS rows (caller commits)."""
         # -- file_index entry -----------------------------------------------
         if file_path is not None:
             rel_path = str(file_path)
@@ -3369,35 +3887,50 @@ class IncidentIndexDatabase:
                 (rel_path, file_hash, file_mtime),
             )
 
+        self._upsert_fts_row(cursor, update.incident_id, "update", update.id, update.message)
+
+    @staticmethod
+    def _upsert_fts_row(
+        cursor: sqlite3.Cursor,
+        incident_id: str,
+        source: str,
+        source_id: str,
+        content: str,
+    ):
+        """
+        Store one record/note's searchable text in fts_source.
+
+        An existing row is updated in place (keeping its rowid); the
+        fts_source triggers re-index it in incidents_fts.
+        """
         cursor.execute(
-            "INSERT INTO incidents_fts (incident_id, source, source_id, content) VALUES (?, ?, ?, ?)",
-            (
-                update.incident_id,
-                "update",
-                update.id,
-                update.message,
-            ),
+            """
+            INSERT INTO fts_source (incident_id, source, source_id, content)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(source, source_id) DO UPDATE SET
+                incident_id = excluded.incident_id,
+                content     = excluded.content
+            """,
+            (incident_id, source, source_id, content),
         )
 
-        conn.commit()
-        conn.close()
-
     def remove_incident_from_index(self, incident_id: str):
         """Remove incident and all its notes from index."""
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM incidents_fts WHERE incident_id = ?", (incident_id,))
-        cursor.execute("DELETE FROM kv_store WHERE incident_id = ?", (incident_id,))
-        conn.commit()
-        conn.close()
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute("DELETE FROM fts_source WHERE incident_id = ?", (incident_id,))
+            cursor.execute("DELETE FROM kv_store WHERE incident_id = ?", (incident_id,))
+
+    def optimize_fts(self):
+        """Merge the FTS index's segments (worthwhile after a bulk reindex)."""
+        with self.conn:
+            self.conn.execute("INSERT INTO incidents_fts(incidents_fts) VALUES('optimize')")
 
     def remove_file_from_index(self, file_path: Path):
         """Remove a specific file entry from file_index."""
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM file_index WHERE file_path = ?", (str(file_path),))
-        conn.commit()
-        conn.close()
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute("DELETE FROM file_index WHERE file_path = ?", (str(file_path),))
 
     def list_incidents_from_index(
         self,
@@ -3407,12 +3940,11 @@ class IncidentIndexDatabase:
         limit: int = 50,
     ) -> List[str]:
         """List incident IDs from index with filters."""
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
     
         # Start with all incidents (source_id = incident_id for incident rows in FTS)
         incident_ids_query = (
-            "SELECT DISTINCT incident_id AS id FROM incidents_fts WHERE source = 'incident'"
+            "SELECT incident_id AS id FROM fts_source WHERE source = 'incident'"
         )
         params = []
 
@@ -3423,54 +3955,19 @@ class IncidentIndexDatabase:
                 if not field:
                     continue  # Skip unknown fields
 
-                if field.field_type == "single":
-                    incident_ids_query += f"""
-                        AND incident_id IN (
-                            SELECT incident_id FROM kv_store
-                            WHERE key = ? AND (
-                                value_string = ? OR
-                                value_integer = ? OR
-                                value_float = ?
-                            ) AND update_id IS NULL
-                        )
-                    """
-                    params.extend([field_name, value, value, value])
-                else:  # multi - value must be in the list
-                    if isinstance(value, list):
-                        # Match ANY value in the list
-                        value_placeholders = ",".join("?" * len(value))
-                        incident_ids_query += f"""
-                            AND incident_id IN (
-                                SELECT incident_id FROM kv_store
-                                WHERE key = ? AND (
-                                    value_string IN ({value_placeholders}) OR
-                                    value_integer IN ({value_placeholders}) OR
-                                    value_float IN ({value_placeholders})
-                                ) AND update_id IS NULL
-                            )
-                        """
-                        params.append(field_name)
-                        params.extend(value)
-                        params.extend(value)
-                        params.extend(value)
-                    else:
-                        incident_ids_query += f"""
-                            AND incident_id IN (
-                                SELECT incident_id FROM kv_store
-                                WHERE key = ? AND (
-                                    value_string = ? OR
-                                    value_integer = ? OR
-                                    value_float = ?
-                                ) AND update_id IS NULL
-                            )
-                        """
-                        params.extend([field_name, value, value, value])
+                # A multi field matches if it holds ANY of the listed values
+                values = value if field.field_type != "single" and isinstance(value, list) else [value]
+                incident_ids_query += f"""
+                    AND incident_id IN ({self._kv_value_probe_sql(len(values))})
+                """
+                params.extend([field_name, *values] * 3)
 
-        # Apply FTS search
+        # Apply FTS search (uncapped: the outer query orders by id, so any
+        # cap on matches would silently drop the newest records)
         if search:
             incident_ids_query += """
                 AND incident_id IN (
-                    SELECT DISTINCT incident_id FROM incidents_fts
+                    SELECT incident_id FROM incidents_fts
                     WHERE incidents_fts MATCH ?
                 )
             """
@@ -3482,247 +3979,160 @@ class IncidentIndexDatabase:
         cursor.execute(incident_ids_query, params)
         incident_ids = [row[0] for row in cursor.fetchall()]
     
-        conn.close()
         return incident_ids
 
+    @staticmethod
+    def _kv_value_probe_sql(value_count: int) -> str:
+        """
+        Subquery for the records holding a key with any of value_count values.
+
+        One SELECT per value column, joined with UNION ALL, so each branch
+        seeks that column's (key, value) index rather than the planner
+        scanning every row of the key to test an OR of the three columns.
+        Takes (key, *values) once per branch as parameters.
+        """
+        placeholders = ",".join("?" * value_count)
+        return " UNION ALL ".join(
+            f"SELECT incident_id FROM kv_store WHERE key = ? AND {column} IN ({placeholders}) "
+            f"AND update_id IS NULL"
+            for column in ("value_string", "value_integer", "value_float")
+        )
+
     def clear_index(self):
         """Clear all entries from index."""
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM file_index")
-        cursor.execute("DELETE FROM incidents_fts")
-        cursor.execute("DELETE FROM kv_store")
-        conn.commit()
-        conn.close()
-
-    def index_kv_data(self, incident: Incident, project_config: Optional[ProjectConfig] = None):
-        """Index key-value data for incident (update_id = NULL)."""
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
-        now = self._generate_timestamp()
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute("DELETE FROM file_index")
+            # Empty incidents_fts in one step, then empty fts_source without
+            # its delete trigger: a per-row 'delete' against the emptied
+            # external-content index would corrupt it
+            cursor.execute("INSERT INTO incidents_fts(incidents_fts) VALUES('delete-all')")
+            cursor.execute("DROP TRIGGER IF EXISTS fts_source_ad")
+            cursor.execute("DELETE FROM fts_source")
+            cursor.execute(self.FTS_SOURCE_DELETE_TRIGGER_SQL)
+            cursor.execute("DELETE FROM kv_store")
+
+    def index_kv_data(self, incident: Incident, project_config: Optional[ProjectConfig] = None,
+                      now: Optional[str] = None):
+        """Index key-value data for incident (update_id = NULL).
+
+        Args:
+            now: created_at for the new rows; generated if omitted, so bulk
+                callers can compute it once.
+        """
+        with self.conn:
+            cursor = self.conn.cursor()
     
-        # Clear existing KV data for this incident (incident-level only)
-        cursor.execute("DELETE FROM kv_store WHERE incident_id = ? AND update_id IS NULL", (incident.id,))
+            # Clear existing KV data for this incident (incident-level only)
+            cursor.execute("DELETE FROM kv_store WHERE incident_id = ? AND update_id IS NULL", (incident.id,))
     
-        # Insert string KV data
-        for key, values in (incident.kv_strings or {}).items():
-            # Check if field should be indexed
-            if project_config:
-                field = project_config.get_special_field(key, for_record=True)
-                if field and not field.index_values:
-                    continue  # Skip indexing this field
-            
-            for value in values:
-                try:
-                    cursor.execute(
-                        """INSERT INTO kv_store 
-                           (incident_id, update_id, key, value_string, created_at) 
-                           VALUES (?, NULL, ?, ?, ?)""",
-                        (incident.id, key, value, now)
-                    )
-                except sqlite3.IntegrityError:
-                    pass  # Duplicate, skip
-    
-        # Insert integer KV data
-        for key, values in (incident.kv_integers or {}).items():
-            # Check if field should be indexed
-            if project_config:
-                field = project_config.get_special_field(key, for_record=True)
-                if field and not field.index_values:
-                    continue  # Skip indexing this field
-            
-            for value in values:
-                try:
-                    cursor.execute(
-                        """INSERT INTO kv_store 
-                           (incident_id, update_id, key, value_integer, created_at) 
-                           VALUES (?, NULL, ?, ?, ?)""",
-                        (incident.id, key, value, now)
-                    )
-                except sqlite3.IntegrityError:
-                    pass
-    
-        # Insert float KV data
-        for key, values in (incident.kv_floats or {}).items():
-            # Check if field should be indexed
-            if project_config:
-                field = project_config.get_special_field(key, for_record=True)
-                if field and not field.index_values:
-                    continue  # Skip indexing this field
-
-            for value in values:
-                try:
-                    cursor.execute(
-                        """INSERT INTO kv_store
-                           (incident_id, update_id, key, value_float, created_at)
-                           VALUES (?, NULL, ?, ?, ?)""",
-                        (incident.id, key, value, now)
-                    )
-                except sqlite3.IntegrityError:
-                    pass
-
-        # Insert secure KV data (stored in value_secure column)
-        for key, values in (incident.kv_secure or {}).items():
-            # Check if field should be indexed
-            if project_config:
-                field = project_config.get_special_field(key, for_record=True)
-                if field and not field.index_values:
-                    continue  # Skip indexing this field
-
-            for value in values:
-                try:
-                    cursor.execute(
-                        """INSERT INTO kv_store
-                           (incident_id, update_id, key, value_secure, created_at)
-                           VALUES (?, NULL, ?, ?, ?)""",
-                        (incident.id, key, str(value), now)
-                    )
-                except sqlite3.IntegrityError:
-                    pass
-
-        conn.commit()
-        conn.close()
+            self._insert_kv_rows(
+                cursor, incident.id, None,
+                (incident.kv_strings, incident.kv_integers, incident.kv_floats, incident.kv_secure),
+                project_config, for_record=True, now=now,
+            )
 
     def index_update_kv_data(self, incident_id: str, update_id: str,
                             kv_strings: Optional[Dict] = None,
                             kv_integers: Optional[Dict] = None,
                             kv_floats: Optional[Dict] = None,
                             kv_secure: Optional[Dict] = None,
-                            project_config: Optional[ProjectConfig] = None):
-        """Index key-value data for update (update_id is NOT NULL)."""
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
-        now = self._generate_timestamp()
-    
-        # Insert string KV data for update
-        for key, values in (kv_strings or {}).items():
-            # Check if field should be indexed
-            if project_config:
-                field = project_config.get_special_field(key, for_record=False)
-                if field and not field.index_values:
-                    continue  # Skip indexing this field
-            
-            for value in values:
-                try:
-                    cursor.execute(
-                        """INSERT INTO kv_store 
-                           (incident_id, update_id, key, value_string, created_at) 
-                           VALUES (?, ?, ?, ?, ?)""",
-                        (incident_id, update_id, key, value, now)
-                    )
-                except sqlite3.IntegrityError:
-                    pass
-    
-        # Insert integer KV data for update
-        for key, values in (kv_integers or {}).items():
-            # Check if field should be indexed
-            if project_config:
-                field = project_config.get_special_field(key, for_record=False)
-                if field and not field.index_values:
-                    continue  # Skip indexing this field
-            
-            for value in values:
-                try:
-                    cursor.execute(
-                        """INSERT INTO kv_store 
-                           (incident_id, update_id, key, value_integer, created_at) 
-                           VALUES (?, ?, ?, ?, ?)""",
-                        (incident_id, update_id, key, value, now)
-                    )
-                except sqlite3.IntegrityError:
-                    pass
-    
-        # Insert float KV data for update
-        for key, values in (kv_floats or {}).items():
-            # Check if field should be indexed
-            if project_config:
-                field = project_config.get_special_field(key, for_record=False)
-                if field and not field.index_values:
-                    continue  # Skip indexing this field
-
-            for value in values:
-                try:
-                    cursor.execute(
-                        """INSERT INTO kv_store
-                           (incident_id, update_id, key, value_float, created_at)
-                           VALUES (?, ?, ?, ?, ?)""",
-                        (incident_id, update_id, key, value, now)
-                    )
-                except sqlite3.IntegrityError:
-                    pass
-
-        # Insert secure KV data for update (stored in value_secure column)
-        for key, values in (kv_secure or {}).items():
-            # Check if field should be indexed
-            if project_config:
-                field = project_config.get_special_field(key, for_record=False)
-                if field and not field.index_values:
-                    continue  # Skip indexing this field
+                            project_config: Optional[ProjectConfig] = None,
+                            now: Optional[str] = None):
+        """Index key-value data for update (update_id is NOT NULL); now as for index_kv_data()."""
+        with self.conn:
+            self._insert_kv_rows(
+                self.conn.cursor(), incident_id, update_id,
+                (kv_strings, kv_integers, kv_floats, kv_secure),
+                project_config, for_record=False, now=now,
+            )
 
-            for value in values:
-                try:
-                    cursor.execute(
-                        """INSERT INTO kv_store
-                           (incident_id, update_id, key, value_secure, created_at)
-                           VALUES (?, ?, ?, ?, ?)""",
-                        (incident_id, update_id, key, str(value), now)
-                    )
-                except sqlite3.IntegrityError:
-                    pass
+    def _insert_kv_rows(
+        self,
+        cursor: sqlite3.Cursor,
+        incident_id: str,
+        update_id: Optional[str],
+        kv_maps: tuple,
+        project_config: Optional[ProjectConfig],
+        for_record: bool,
+        now: Optional[str] = None,
+    ):
+        """
+        Insert KV values with one executemany() per value column.
 
-        conn.commit()
-        conn.close()
+        kv_maps holds the (strings, integers, floats, secure) dicts of
+        key -> list of values, matching KV_VALUE_COLUMNS. Fields whose special
+        field definition sets index_values = false are skipped; secure values
+        are stored as strings.
+        """
+        if now is None:
+            now = self._generate_timestamp()
+        
+        def indexed(key: str) -> bool:
+            if not project_config:
+                return True
+            field = project_config.get_special_field(key, for_record=for_record)
+            return not (field and not field.index_values)
+        
+        for column, kv_map in zip(self.KV_VALUE_COLUMNS, kv_maps):
+            if not kv_map:
+                continue
+            convert = str if column == "value_secure" else None
+            rows = [
+                (incident_id, update_id, key, convert(value) if convert else value, now)
+                for key, values in kv_map.items()
+                if indexed(key)
+                for value in values
+            ]
+            if rows:
+                cursor.executemany(self.KV_INSERT_SQL[column], rows)
 
     def remove_kv_key(self, incident_id: str, key: str, update_id: Optional[str] = None):
         """Remove all values for a key."""
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
+        with self.conn:
+            cursor = self.conn.cursor()
     
-        if update_id:
-            cursor.execute(
-                "DELETE FROM kv_store WHERE incident_id = ? AND update_id = ? AND key = ?", 
-                (incident_id, update_id, key)
-            )
-        else:
-            cursor.execute(
-                "DELETE FROM kv_store WHERE incident_id = ? AND update_id IS NULL AND key = ?", 
-                (incident_id, key)
-            )
+            if update_id:
+                cursor.execute(
+                    "DELETE FROM kv_store WHERE incident_id = ? AND update_id = ? AND key = ?", 
+                    (incident_id, update_id, key)
+                )
+            else:
+                cursor.execute(
+                    "DELETE FROM kv_store WHERE incident_id = ? AND update_id IS NULL AND key = ?", 
+                    (incident_id, key)
+                )
     
-        conn.commit()
-        conn.close()
     
     def remove_kv_value(self, incident_id: str, key: str, op: str, value: Any, update_id: Optional[str] = None):
         """Remove specific key/value pair."""
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
-    
-        if op == KVParser.TYPE_STRING:
-            value_column = "value_string"
-        elif op == KVParser.TYPE_INTEGER:
-            value_column = "value_integer"
-        elif op == KVParser.TYPE_FLOAT:
-            value_column = "value_float"
-        else:
-            raise ValueError(f"Invalid operator: {op}")
+        with self.conn:
+            cursor = self.conn.cursor()
+    
+            if op == KVParser.TYPE_STRING:
+                value_column = "value_string"
+            elif op == KVParser.TYPE_INTEGER:
+                value_column = "value_integer"
+            elif op == KVParser.TYPE_FLOAT:
+                value_column = "value_float"
+            else:
+                raise ValueError(f"Invalid operator: {op}")
     
-        if update_id:
-            cursor.execute(
-                f"""DELETE FROM kv_store 
-                   WHERE incident_id = ? AND update_id = ? AND key = ? 
-                   AND {value_column} = ?""",
-                (incident_id, update_id, key, value)
-            )
-        else:
-            cursor.execute(
-                f"""DELETE FROM kv_store 
-                   WHERE incident_id = ? AND update_id IS NULL AND key = ? 
-                   AND {value_column} = ?""",
-                (incident_id, key, value)
-            )
+            if update_id:
+                cursor.execute(
+                    f"""DELETE FROM kv_store 
+                       WHERE incident_id = ? AND update_id = ? AND key = ? 
+                       AND {value_column} = ?""",
+                    (incident_id, update_id, key, value)
+                )
+            else:
+                cursor.execute(
+                    f"""DELETE FROM kv_store 
+                       WHERE incident_id = ? AND update_id IS NULL AND key = ? 
+                       AND {value_column} = ?""",
+                    (incident_id, key, value)
+                )
     
-        conn.commit()
-        conn.close()
 
     def search_kv(
         self, 
@@ -3750,11 +4160,7 @@ class IncidentIndexDatabase:
         Raises:
             ValueError: If operator is not in the allowed set
         """
-        # Whitelist of allowed operators
-        ALLOWED_OPERATORS = {'=', '<', '>', '<=', '>=', "<>", "!=", "^"}
-
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
 
         # Separate equality, inequality, and "in" conditions
         equality_conditions = []
@@ -3763,8 +4169,8 @@ class IncidentIndexDatabase:
 
         for key, operator, value in ksearch_list:
             # Validate operator
-            if operator not in ALLOWED_OPERATORS:
-                raise ValueError(f"Invalid operator '{operator}'. Must be one of: {ALLOWED_OPERATORS}")
+            if operator not in self.SEARCH_OPERATORS:
+                raise ValueError(f"Invalid operator '{operator}'. Must be one of: {set(self.SEARCH_OPERATORS)}")
 
             if operator in ('!=', '<>'):
                 inequality_conditions.append((key, operator, value))
@@ -3773,235 +4179,137 @@ class IncidentIndexDatabase:
             else:
                 equality_conditions.append((key, operator, value))
         
-        # Start with base table for equality conditions
-        select_clause = "SELECT DISTINCT base.incident_id, base.update_id"
-        from_clause = "FROM kv_store base"
-        joins = []
-        where_parts = ["1=1"]
-        params = []
-        join_counter = 0
-        
-        # Add update_id filter based on search_updates
-        if search_updates:
-            where_parts.append("base.update_id IS NOT NULL")
-        else:
-            where_parts.append("base.update_id IS NULL")
+        # Each criterion is an EXISTS semi-join (NOT EXISTS anti-join for an
+        # inequality) on the same record/note: a self-join per criterion would
+        # multiply rows for multi-valued keys before DISTINCT folds them. The
+        # SQL depends only on the criteria's shape, so it is built (and
+        # prepared by SQLite) once per shape.
+        criteria = []  # (test, operator, ((column, value_count), ...))
+        params = list(incident_ids or []) + list(update_ids or [])
+        
+        def add_criterion(test: str, operator: str, key: str, values: List[Any], include_secure: bool):
+            typed_values = self._typed_values(values, include_secure)
+            criteria.append((test, operator, tuple((column, len(vals)) for column, vals in typed_values)))
+            params.append(key)
+            for _column, vals in typed_values:
+                params.extend(vals if operator == 'IN' else vals[:1])
         
-        # Add incident_ids filter
-        if incident_ids:
-            placeholders = ",".join("?" * len(incident_ids))
-            where_parts.append(f"base.incident_id IN ({placeholders})")
-            params.extend(incident_ids)
-        
-        # Add update_ids filter
-        if update_ids:
-            placeholders = ",".join("?" * len(update_ids))
-            where_parts.append(f"base.update_id IN ({placeholders})")
-            params.extend(update_ids)
-        
-        # Add each EQUALITY/COMPARISON search criterion as an INNER JOIN
         for key, operator, value in equality_conditions:
-            # Create alias for this join
-            alias = f"kv{join_counter}"
-            join_counter += 1
-            
-            # Build JOIN condition for this criterion
             # value_secure only supports = and != (no ordering), so only add for = operator
-            if operator == '=':
-                join = f"""INNER JOIN kv_store {alias} ON
-                    base.incident_id = {alias}.incident_id
-                    AND (base.update_id = {alias}.update_id OR (base.update_id IS NULL AND {alias}.update_id IS NULL))
-                    AND (
-                        ({alias}.key = ? AND {alias}.value_float {operator} ?)
-                        OR ({alias}.key = ? AND {alias}.value_integer {operator} ?)
-                        OR ({alias}.key = ? AND {alias}.value_string {operator} ?)
-                        OR ({alias}.key = ? AND {alias}.value_secure {operator} ?)
-                    )"""
-            else:
-                join = f"""INNER JOIN kv_store {alias} ON
-                    base.incident_id = {alias}.incident_id
-                    AND (base.update_id = {alias}.update_id OR (base.update_id IS NULL AND {alias}.update_id IS NULL))
-                    AND (
-                        ({alias}.key = ? AND {alias}.value_float {operator} ?)
-                        OR ({alias}.key = ? AND {alias}.value_integer {operator} ?)
-                        OR ({alias}.key = ? AND {alias}.value_string {operator} ?)
-                    )"""
-            joins.append(join)
-
-            # Add parameters for type attempts
-            try:
-                float_val = float(value)
-            except (ValueError, TypeError):
-                float_val = None
-
-            try:
-                int_val = int(value)
-            except (ValueError, TypeError):
-                int_val = None
-
-            str_val = str(value)
-
-            # Add parameters: key and values for each type
-            if operator == '=':
-                params.extend([
-                    key, float_val,
-                    key, int_val,
-                    key, str_val,
-                    key, str_val,  # value_secure uses same string value
-                ])
-            else:
-                params.extend([
-                    key, float_val,
-                    key, int_val,
-                    key, str_val,
-                ])
+            add_criterion("EXISTS", operator, key, [value], include_secure=(operator == '='))
         
-        # Add each IN-condition as an INNER JOIN using IN (?, ?, ...)
         for key, operator, value in in_conditions:
-            alias = f"kv{join_counter}"
-            join_counter += 1
-
             # Split pipe-delimited values
             values_list = [v.strip() for v in value.split('|') if v.strip()]
-            n = len(values_list)
-
-            float_placeholders = ",".join("?" * n)
-            int_placeholders = ",".join("?" * n)
-            str_placeholders = ",".join("?" * n)
-
-            join = f"""INNER JOIN kv_store {alias} ON
-                base.incident_id = {alias}.incident_id
-                AND (base.update_id = {alias}.update_id OR (base.update_id IS NULL AND {alias}.update_id IS NULL))
-                AND (
-                    ({alias}.key = ? AND {alias}.value_float IN ({float_placeholders}))
-                    OR ({alias}.key = ? AND {alias}.value_integer IN ({int_placeholders}))
-                    OR ({alias}.key = ? AND {alias}.value_string IN ({str_placeholders}))
-                    OR ({alias}.key = ? AND {alias}.value_secure IN ({str_placeholders}))
-                )"""
-            joins.append(join)
-
-            float_vals = []
-            int_vals = []
-            str_vals = []
-            for v in values_list:
-                try:
-                    float_vals.append(float(v))
-                except (ValueError, TypeError):
-                    float_vals.append(None)
-                try:
-                    int_vals.append(int(v))
-                except (ValueError, TypeError):
-                    int_vals.append(None)
-                str_vals.append(str(v))
-
-            params.extend([key] + float_vals + [key] + int_vals + [key] + str_vals + [key] + str_vals)
+            add_criterion("EXISTS", 'IN', key, values_list, include_secure=True)
+        
+        # A record/note is excluded if it holds the key with a value equal to
+        # the search value
+        for key, operator, value in inequality_conditions:
+            add_criterion("NOT EXISTS", '=', key, [value], include_secure=True)
+        
+        query = self._build_search_sql(
+            search_updates,
+            len(incident_ids or []),
+            len(update_ids or []),
+            tuple(criteria),
+            bool(inequality_conditions),
+        )
+        cursor.execute(query, params)
+        results = cursor.fetchall()
 
-        # Build query for equality/in conditions
-        query_with_joins = select_clause + " " + from_clause
-        for join in joins:
-            query_with_joins += " " + join
-        query_with_joins += " WHERE " + " AND ".join(where_parts)
+        # When searching updates, return (incident_id, update_id) tuples
+        # When searching incidents, return just incident_id strings
+        if return_updates and search_updates:
+            return [(row[0], row[1]) for row in results]
+        else:
+            return [row[1] if return_updates else row[0] for row in results]
+    
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _build_search_sql(
+        search_updates: bool,
+        incident_id_count: int,
+        update_id_count: int,
+        criteria: tuple,
+        ordered: bool,
+    ) -> str:
+        """
+        Build search_kv()'s query for one shape of search.
 
-        cursor.execute(query_with_joins, params)
-        results = cursor.fetchall()
+        Parameters are bound in order: the incident_ids, the update_ids, then
+        per criterion its key followed by its typed values.
 
-        # If no inequality conditions, we're done
-        if not inequality_conditions:
-            conn.close()
-            # When searching updates, return (incident_id, update_id) tuples
-            # When searching incidents, return just incident_id strings
-            if return_updates and search_updates:
-                return [(row[0], row[1]) for row in results]
-            else:
-                return [row[1] if return_updates else row[0] for row in results]
+        Args:
+            criteria: (test, operator, ((column, value_count), ...)) per
+                criterion; test is "EXISTS" or "NOT EXISTS", operator a
+                comparison or 'IN'
+            ordered: Sort the rows by (incident_id, update_id)
+        """
+        where_parts = ["1=1"]
         
-        # Handle inequality conditions by EXCLUSION
-        # Start with the results from equality/in conditions (or all records if none)
-        if equality_conditions or in_conditions:
-            # Use results from equality/in search as starting set
-            candidate_set = set((row[0], row[1]) for row in results)
+        # Add update_id filter based on search_updates
+        if search_updates:
+            where_parts.append("base.update_id IS NOT NULL")
         else:
-            # No equality/in conditions - start with all records matching base filters
-            cursor.execute(query_with_joins, params)
-            candidate_set = set((row[0], row[1]) for row in cursor.fetchall())
+            where_parts.append("base.update_id IS NULL")
         
-        # For each inequality condition, exclude records that match the EQUALITY
-        for key, operator, value in inequality_conditions:
-            # Find records where key = value (these should be excluded)
-            exclude_query = """
-                SELECT DISTINCT incident_id, update_id
-                FROM kv_store
-                WHERE (
-                    (key = ? AND value_float = ?)
-                    OR (key = ? AND value_integer = ?)
-                    OR (key = ? AND value_string = ?)
-                    OR (key = ? AND value_secure = ?)
-                )
-            """
-            
-            # Add search_updates filter
-            if search_updates:
-                exclude_query += " AND update_id IS NOT NULL"
-            else:
-                exclude_query += " AND update_id IS NULL"
-            
-            # Add incident_ids filter if provided
-            if incident_ids:
-                placeholders = ",".join("?" * len(incident_ids))
-                exclude_query += f" AND incident_id IN ({placeholders})"
-            
-            # Add update_ids filter if provided
-            if update_ids:
-                placeholders = ",".join("?" * len(update_ids))
-                exclude_query += f" AND update_id IN ({placeholders})"
-            
-            exclude_params = []
-            
-            # Add parameters for type attempts
+        if incident_id_count:
+            where_parts.append(f"base.incident_id IN ({','.join('?' * incident_id_count)})")
+        if update_id_count:
+            where_parts.append(f"base.update_id IN ({','.join('?' * update_id_count)})")
+        
+        for i, (test, operator, columns) in enumerate(criteria):
+            alias = f"kv{i}"
+            parts = []
+            for column, value_count in columns:
+                if operator == 'IN':
+                    parts.append(f"{alias}.{column} IN ({','.join('?' * value_count)})")
+                else:
+                    parts.append(f"{alias}.{column} {operator} ?")
+            value_match = "(" + " OR ".join(parts) + ")" if parts else "0"
+            where_parts.append(f"""{test} (SELECT 1 FROM kv_store {alias} WHERE
+                {alias}.incident_id = base.incident_id
+                AND {alias}.update_id IS base.update_id
+                AND {alias}.key = ? AND {value_match})""")
+        
+        query = "SELECT DISTINCT base.incident_id, base.update_id FROM kv_store base WHERE " + " AND ".join(where_parts)
+        if ordered:
+            query += " ORDER BY base.incident_id, base.update_id"
+        return query
+
+    @staticmethod
+    def _typed_values(values: List[Any], include_secure: bool) -> List[tuple]:
+        """
+        Convert search values for each kv_store column they can be compared with.
+
+        A value is compared against every column its text converts to: float,
+        integer and string (plus value_secure if include_secure). Columns it
+        cannot convert to are left out rather than compared with NULL, so a
+        plain string probes value_string alone and can use its index.
+
+        Returns:
+            [(column, converted values), ...] for the columns with any values
+        """
+        float_vals = []
+        int_vals = []
+        for v in values:
             try:
-                float_val = float(value)
+                float_vals.append(float(v))
             except (ValueError, TypeError):
-                float_val = None
-            
+                pass
             try:
-                int_val = int(value)
+                int_vals.append(int(v))
             except (ValueError, TypeError):
-                int_val = None
-            
-            str_val = str(value)
-            
-            exclude_params.extend([
-                key, float_val,
-                key, int_val,
-                key, str_val,
-                key, str_val,  # value_secure
-            ])
-            
-            # Add incident_ids to params if needed
-            if incident_ids:
-                exclude_params.extend(incident_ids)
-            
-            # Add update_ids to params if needed
-            if update_ids:
-                exclude_params.extend(update_ids)
-            
-            cursor.execute(exclude_query, exclude_params)
-            exclude_set = set((row[0], row[1]) for row in cursor.fetchall())
-            
-            # Remove excluded records from candidate set
-            candidate_set -= exclude_set
-        
-        conn.close()
+                pass
+        str_vals = [str(v) for v in values]
         
-        # Extract the appropriate column based on return_updates
-        # When searching updates, return (incident_id, update_id) tuples
-        # When searching incidents, return just incident_id strings
-        if return_updates and search_updates:
-            return [(row[0], row[1]) for row in sorted(candidate_set)]
-        else:
-            return [row[1] if return_updates else row[0] for row in sorted(candidate_set)]
-    
-    
+        columns = [("value_float", float_vals), ("value_integer", int_vals), ("value_string", str_vals)]
+        if include_secure:
+            columns.append(("value_secure", str_vals))
+        return [(column, typed_vals) for column, typed_vals in columns if typed_vals]
+
     def get_sorted_incidents(self, incident_ids: List[str], ksort_list: List[tuple], update_id: Optional[str] = None) -> List[str]:
         """
         Sort by key-value criteria.
@@ -4017,58 +4325,35 @@ class IncidentIndexDatabase:
         if not ksort_list or not incident_ids:
             return incident_ids
         
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
-        
-        # Fetch all KV data for incidents
-        kv_data = {}
+        cursor = self.conn.cursor()
         
-        for inc_id in incident_ids:
-            kv_data[inc_id] = {}
-            
-            query = """
-                SELECT key, value_string, value_integer, value_float 
-                FROM kv_store 
-                WHERE incident_id = ? AND update_id {}
-            """.format("= ?" if update_id else "IS NULL")
-            
-            params = [inc_id]
+        # The IDs are passed as one JSON array, so any number of them binds to
+        # a single parameter; json_each's key keeps their input position
+        select_parts = ["ids.value"]
+        order_parts = []
+        params = []
+        for i, (sort_key_name, ascending) in enumerate(ksort_list):
+            # Each sort key's first value (by insertion order); a secure value
+            # reads as NULL, like a missing key
+            select_parts.append(f"""(SELECT COALESCE(value_string, value_integer, value_float)
+                FROM kv_store
+                WHERE incident_id = ids.value AND key = ? AND update_id {"= ?" if update_id else "IS NULL"}
+                ORDER BY id LIMIT 1) AS sort{i}""")
+            params.append(sort_key_name)
             if update_id:
                 params.append(update_id)
-            
-            cursor.execute(query, params)
-            
-            for key, v_str, v_int, v_float in cursor.fetchall():
-                if key not in kv_data[inc_id]:
-                    kv_data[inc_id][key] = []
-                
-                # Store the actual value (whichever is not NULL)
-                value = v_str if v_str is not None else (v_int if v_int is not None else v_float)
-                kv_data[inc_id][key].append(value)
-        
-        conn.close()
+            # Missing values sort last in either direction
+            order_parts.append(f"sort{i} IS NULL, sort{i} {'ASC' if ascending else 'DESC'}")
+        order_parts.append("ids.key")
         
-        # Sort using custom key function
-        def sort_key(incident_id):
-            keys = []
-            for sort_key_name, ascending in ksort_list:
-                value = None
-                
-                if sort_key_name in kv_data[incident_id] and kv_data[incident_id][sort_key_name]:
-                    value = kv_data[incident_id][sort_key_name][0]
-                
-                if value is None:
-                    keys.append((1, ""))
-                else:
-                    if isinstance(value, (int, float)):
-                        sort_val = value if ascending else -value
-                    else:
-                        sort_val = value if ascending else ''.join(chr(255 - ord(c)) for c in str(value))
-                    keys.append((0, sort_val))
-            return tuple(keys)
+        query = (
+            f"SELECT {', '.join(select_parts)} FROM json_each(?) AS ids "
+            f"ORDER BY {', '.join(order_parts)}"
+        )
+        params.append(json.dumps(incident_ids))
         
-        sorted_ids = sorted(incident_ids, key=sort_key)
-        return sorted_ids
+        cursor.execute(query, params)
+        return [row[0] for row in cursor.fetchall()]
 
 
 # ============================================================================
@@ -4106,10 +4391,7 @@ def validate_incident_record(incident: 'Incident', project_config: 'ProjectConfi
     special_fields = {name: f for name, f in all_fields.items() if f.enabled}
 
     def _strip(key: str) -> str:
-        for suffix in ('__string', '__integer', '__float'):
-            if key.endswith(suffix):
-                return key[: -len(suffix)]
-        return key
+        return key.rpartition('__')[0] if key.endswith(_TYPE_SUFFIXES) else key
 
     errors: List[str] = []
 
@@ -4132,32 +4414,12 @@ def validate_incident_record(incident: 'Incident', project_config: 'ProjectConfi
         if not has_value:
             errors.append(f"required field '{field_name}' is missing or empty")
 
-    # accepted_values check
-    for key, values in incident.kv_strings.items():
-        field = special_fields.get(_strip(key))
-        if field and field.accepted_values:
-            for v in values:
-                if v not in field.accepted_values:
-                    errors.append(
-                        f"field '{_strip(key)}': invalid value '{v}' "
-                        f"(accepted: {', '.join(field.accepted_values)})"
-                    )
-
-    for key, values in incident.kv_integers.items():
-        field = special_fields.get(_strip(key))
-        if field and field.accepted_values:
-            for v in values:
-                if str(v) not in field.accepted_values:
-                    errors.append(
-                        f"field '{_strip(key)}': invalid value '{v}' "
-                        f"(accepted: {', '.join(field.accepted_values)})"
-                    )
-
-    for key, values in incident.kv_floats.items():
-        field = special_fields.get(_strip(key))
-        if field and field.accepted_values:
-            for v in values:
-                if str(v) not in field.accepted_values:
+    # accepted_values check (string, integer and float values alike)
+    for kv_store in (incident.kv_strings, incident.kv_integers, incident.kv_floats):
+        for key, values in kv_store.items():
+            field = special_fields.get(_strip(key))
+            if field and field.accepted_values:
+                for v in field.invalid_values(values):
                     errors.append(
                         f"field '{_strip(key)}': invalid value '{v}' "
                         f"(accepted: {', '.join(field.accepted_values)})"
@@ -4347,6 +4609,9 @@ def validate_user_config(user_config: dict) -> List[str]:
 class IncidentReindexer:
     """Rebuild index from files."""
 
+    # Records reindex_all() loads concurrently before indexing them in order
+    LOAD_BATCH_SIZE = 64
+
     def __init__(self, storage: IncidentFileStorage, index_db: IncidentIndexDatabase, project_config: ProjectConfig):
         self.storage = storage
         self.index_db = index_db
@@ -4381,65 +4646,84 @@ class IncidentReindexer:
         indexed_updates = 0
         skipped_updates = 0
         validation_failures: List[tuple] = []  # (incident_id, [errors])
+        now = self.index_db._generate_timestamp()
+
+        # Each batch's files are read and parsed on a thread pool; index
+        # writes stay on this thread, in record order
+        max_workers = min(16, (os.cpu_count() or 1) * 2)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for start in range(0, len(incident_ids), self.LOAD_BATCH_SIZE):
+                batch = incident_ids[start:start + self.LOAD_BATCH_SIZE]
+                unchanged_flags = [
+                    not force and self.index_db.is_file_unchanged(
+                        self.storage._get_incident_path(incident_id), skip_mtime=skip_mtime
+                    )
+                    for incident_id in batch
+                ]
+                loaded = executor.map(self._load_for_reindex, batch, unchanged_flags)
 
-        for incident_id in incident_ids:
-            incident_path = self.storage._get_incident_path(incident_id)
-
-            if not force and self.index_db.is_file_unchanged(incident_path, skip_mtime=skip_mtime):
-                skipped_count += 1
-                if verbose:
-                    print(f"  - {incident_id} (unchanged)")
-                # Still check notes even if record file is unchanged
-                updates_dir = self.storage._get_updates_dir(incident_id)
-                updates = self.storage.load_updates(incident_id)
-                for update in updates:
-                    note_path = updates_dir / f"{update.id}.md"
-                    if self.index_db.is_file_unchanged(note_path, skip_mtime=skip_mtime):
-                        skipped_updates += 1
-                    else:
-                        self.index_db.index_update(update, file_path=note_path)
-                        indexed_updates += 1
-                continue
+                for incident_id, record_unchanged, (incident, updates) in zip(batch, unchanged_flags, loaded):
+                    incident_path = self.storage._get_incident_path(incident_id)
 
-            incident = self.storage.load_incident(incident_id, self.project_config)
-            if incident:
-                # Validate before indexing
-                if not skip_validation:
-                    errors = validate_incident_record(incident, self.project_config)
-                    if errors:
-                        validation_failures.append((incident_id, errors))
+                    if record_unchanged:
+                        skipped_count += 1
                         if verbose:
-                            print(f"  ✗ {incident_id} (validation failed)", file=sys.stderr)
-                        continue  # do not index this record
-
-                self.index_db.remove_incident_from_index(incident_id)
-                self.index_db.index_incident(
-                    incident, self.project_config, file_path=incident_path
-                )
-                self.index_db.index_kv_data(incident, self.project_config)
-                indexed_count += 1
-                if verbose:
-                    print(f"  ✓ {incident_id}", end=":")
-            else:
-                if verbose:
-                    print(f"  ✗ {incident_id} (failed to load)")
+                            print(f"  - {incident_id} (unchanged)")
+                        # Still check notes even if record file is unchanged
+                        updates_dir = self.storage._get_updates_dir(incident_id)
+                        changed_updates = []
+                        for update in updates:
+                            note_path = updates_dir / f"{update.id}.md"
+                            if self.index_db.is_file_unchanged(note_path, skip_mtime=skip_mtime):
+                                skipped_updates += 1
+                            else:
+                                changed_updates.append((update, note_path))
+                        self.index_db.index_updates(changed_updates)
+                        indexed_updates += len(changed_updates)
+                        continue
 
-            # Index notes for this incident
-            updates_dir = self.storage._get_updates_dir(incident_id)
-            updates = self.storage.load_updates(incident_id)
-            for update in updates:
-                note_path = updates_dir / f"{update.id}.md"
-                if not force and self.index_db.is_file_unchanged(note_path, skip_mtime=skip_mtime):
-                    skipped_updates += 1
-                    if verbose:
-                        print(f"-", end="")
-                else:
-                    self.index_db.index_update(update, file_path=note_path)
-                    indexed_updates += 1
+                    if incident:
+                        # Validate before indexing
+                        if not skip_validation:
+                            errors = validate_incident_record(incident, self.project_config)
+                            if errors:
+                                validation_failures.append((incident_id, errors))
+                                if verbose:
+                                    print(f"  ✗ {incident_id} (validation failed)", file=sys.stderr)
+                                continue  # do not index this record
+
+                        self.index_db.remove_incident_from_index(incident_id)
+                        self.index_db.index_incident(
+                            incident, self.project_config, file_path=incident_path
+                        )
+                        self.index_db.index_kv_data(incident, self.project_config, now=now)
+                        indexed_count += 1
+                        if verbose:
+                            print(f"  ✓ {incident_id}", end=":")
+                    else:
+                        if verbose:
+                            print(f"  ✗ {incident_id} (failed to load)")
+
+                    # Index notes for this incident
+                    updates_dir = self.storage._get_updates_dir(incident_id)
+                    changed_updates = []
+                    for update in updates:
+                        note_path = updates_dir / f"{update.id}.md"
+                        if not force and self.index_db.is_file_unchanged(note_path, skip_mtime=skip_mtime):
+                            skipped_updates += 1
+                            if verbose:
+                                print(f"-", end="")
+                        else:
+                            changed_updates.append((update, note_path))
+                            if verbose:
+                                print(f".", end="")
+                    self.index_db.index_updates(changed_updates)
+                    indexed_updates += len(changed_updates)
                     if verbose:
-                        print(f".", end="")
-            if verbose:
-                print()
+                        print()
+
+        if indexed_count or indexed_updates:
+            self.index_db.optimize_fts()
 
         if verbose:
             print(
@@ -4457,6 +4741,21 @@ class IncidentReindexer:
 
         return indexed_count
 
+    def _load_for_reindex(self, incident_id: str, record_unchanged: bool) -> tuple:
+        """
+        Load a record and its notes for reindex_all() (runs on a worker thread).
+
+        Returns:
+            (incident, updates); incident is None when the record file is
+            unchanged (it is not indexed) or failed to load
+        """
+        incident = None
+        if not record_unchanged:
+            incident = self.storage.load_incident(incident_id, self.project_config)
+        # Already on a pool worker: read the notes serially rather than
+        # nesting another pool per record
+        return incident, self.storage.load_updates(incident_id, parallel=False)
+
     def reindex_one(self, incident_id: str, verbose: bool = False, force: bool = False,
                     skip_mtime: bool = False, skip_validation: bool = False) -> bool:
         """
@@ -4532,6 +4831,7 @@ class IncidentReindexer:
         if verbose:
             print(f"  Checking {len(updates)} notes...", end="")
 
+        changed_updates = []
         for update in updates:
             note_path = updates_dir / f"{update.id}.md"
             if not force and self.index_db.is_file_unchanged(note_path, skip_mtime=skip_mtime):
@@ -4539,10 +4839,11 @@ class IncidentReindexer:
                 if verbose:
                     print("-", end="", flush=True)
             else:
-                self.index_db.index_update(update, file_path=note_path)
+                changed_updates.append((update, note_path))
                 indexed_notes += 1
                 if verbose:
                     print(".", end="", flush=True)
+        self.index_db.index_updates(changed_updates)
 
         if verbose:
             print()
@@ -4559,6 +4860,22 @@ class IncidentReindexer:
 class IncidentManager:
     """High-level incident management API."""
     
+    # KV store attribute and converter per KVParser type marker; anything
+    # else (including no marker) is stored as a string
+    _KV_STORE_FOR_TYPE = {
+        KVParser.TYPE_INTEGER: ("kv_integers", int),
+        KVParser.TYPE_FLOAT: ("kv_floats", float),
+    }
+    _DEFAULT_KV_STORE = ("kv_strings", str)
+    
+    # Multi-value CLI flag to suggest per KVParser type marker
+    _MULTI_FLAG_HINTS = {
+        KVParser.TYPE_STRING: "--text-multi/--tm",
+        None: "--text-multi/--tm",
+        KVParser.TYPE_INTEGER: "--number-multi/--nm",
+        KVParser.TYPE_FLOAT: "--decimal-multi/--dm",
+    }
+    
     def __init__(
         self,
         explicit_location: Optional[Path] = None,
@@ -4578,7 +4895,7 @@ class IncidentManager:
             
             if interactive is not None:
                 selection_mode = 'interactive' if interactive else 'contextual'
-            elif not sys.stdin.isatty():
+            elif not StdinHandler.stdin_is_tty():
                 selection_mode = 'contextual'
             
             if selection_mode == 'interactive':
@@ -4599,8 +4916,13 @@ class IncidentManager:
             self.effective_user = DatabaseDiscovery.get_effective_user(self.db_root)
         except RuntimeError:
             self.effective_user = None
+        
+        # template_id -> (template_incident, template_name), or None for a
+        # miss; saves drop the saved record's entry (see _resolve_template)
+        self._template_resolve_cache: Dict[str, Optional[tuple]] = {}
 
-    def _strip_type_suffix(self, key: str) -> str:
+    @staticmethod
+    def _strip_type_suffix(key: str) -> str:
         """
         Strip type suffix from key name.
         
@@ -4614,11 +4936,47 @@ class IncidentManager:
         Returns:
             Base key name without suffix
         """
-        for suffix in ['__string', '__integer', '__float']:
-            if key.endswith(suffix):
-                return key[:-len(suffix)]
+        if key.endswith(_TYPE_SUFFIXES):
+            return key.rpartition('__')[0]
         return key
     
+    @staticmethod
+    def _write_banner(heading: str, detail: Optional[str] = None, options: tuple = ()) -> None:
+        """
+        Write a ruled banner, and any choice lines, to stderr in one write.
+        
+        Args:
+            heading: Banner heading (may span several lines)
+            detail: Optional text shown in its own ruled section
+            options: Choice lines listed under "Options:" after the banner
+        """
+        parts = [f"\n{_BANNER_RULE}\n{heading}\n"]
+        if detail is not None:
+            parts.append(f"{_BANNER_RULE}\n{detail}\n")
+        parts.append(f"{_BANNER_RULE}\n\n")
+        if options:
+            parts.append("Options:\n")
+            parts.extend(f"  {option}\n" for option in options)
+        sys.stderr.write("".join(parts))
+        sys.stderr.flush()
+    
+    @staticmethod
+    def _editor_left_unchanged(editor_result: Optional[str], markdown_content: str) -> bool:
+        """
+        Check whether the editor returned the markdown it was given.
+        
+        launch_editor() strips its result, and markdown_content always starts
+        with the frontmatter delimiter, so the two can only differ by trailing
+        whitespace: a prefix test plus a look at the short tail replaces
+        stripping (copying) the whole document.
+        """
+        if editor_result is None:
+            return True
+        return (
+            markdown_content.startswith(editor_result)
+            and not markdown_content[len(editor_result):].strip()
+        )
+    
     def set_user_override(self, handle: str, email: str):
         """
         Override the effective user identity for this manager instance.
@@ -4642,13 +5000,9 @@ class IncidentManager:
         Returns:
             Template ID string, or None if not found
         """
-        # Check if incident has a template_id field
-        if 'template_id' in incident.kv_strings:
-            values = incident.kv_strings['template_id']
-            if values and values[0]:
-                return values[0]
-        
-        return None
+        # Incident.__init__ normalizes kv_strings to a dict, so one .get suffices
+        values = incident.kv_strings.get('template_id')
+        return values[0] if values and values[0] else None
     
     def _resolve_template(
         self,
@@ -4670,6 +5024,27 @@ class IncidentManager:
             - If record template: (incident, None)
             - If not found: raises RuntimeError
         """
+        # Batch creates resolve the same template repeatedly; only the first
+        # resolution (hit or miss) touches the config or the disk
+        if template_id in self._template_resolve_cache:
+            resolved = self._template_resolve_cache[template_id]
+        else:
+            resolved = self._resolve_template_uncached(template_id)
+            self._template_resolve_cache[template_id] = resolved
+        if resolved is not None:
+            return resolved
+        
+        # Not found
+        raise RuntimeError(
+            f"Template '{template_id}' not found. "
+            f"Not a configured template and not an existing record ID."
+        )
+    
+    def _resolve_template_uncached(
+        self,
+        template_id: str,
+    ) -> Optional[tuple[Optional[Incident], Optional[str]]]:
+        """Resolve a template ID without the cache; None if not found."""
         # First, check if it's a config template
         if self.project_config.has_template(template_id):
             # It's a config template - return the name
@@ -4679,12 +5054,7 @@ class IncidentManager:
         template_incident = self.storage.load_incident(template_id, self.project_config)
         if template_incident:
             return template_incident, None
-        
-        # Not found
-        raise RuntimeError(
-            f"Template '{template_id}' not found. "
-            f"Not a configured template and not an existing record ID."
-        )
+        return None
     
     def _apply_special_fields(
         self,
@@ -4719,6 +5089,14 @@ class IncidentManager:
             handle=self.effective_user['handle'],
             email=self.effective_user['email']
         )
+        # Resolve identity, IDs and timestamps once for all fields of this record
+        ctx = SystemValueContext(
+            user_identity=user_identity,
+            incident_id=record.id,
+            update_id=update_id,
+            template_name=template_name,
+            is_system_note=is_system_note,
+        )
         
         # Get special fields (with template overrides if specified)
         if template_name:
@@ -4739,85 +5117,38 @@ class IncidentManager:
             if field.enabled
         }
         
+        # Fresh KV dicts (an empty one may be shared with the caller), set up
+        # once rather than per field
+        if not record.kv_strings:
+            record.kv_strings = {}
+        if not record.kv_integers:
+            record.kv_integers = {}
+        if not record.kv_floats:
+            record.kv_floats = {}
+        kv_strings, kv_integers, kv_floats = record.kv_strings, record.kv_integers, record.kv_floats
+        
         for field_name, field in special_fields.items():
-            # Skip disabled fields
-            if not field.enabled:
-                continue
-            
             # Determine if we should set this field
             should_set = False
             value_to_set = None
             
-            # Case 1: Field has system_value
+            # Case 1: Field has system_value. Every system field is set on
+            # creation; on updates only editable ones are (editable=True means
+            # "update on edit" for system fields), so non-editable values are
+            # preserved.
             if field.system_value:
-                # Non-editable system fields: ONLY set on creation, never on updates
-                if not field.editable:
-                    if is_create:
-                        should_set = True
-                        value_to_set = SystemValueDeriver.derive_value(
-                            field.system_value,
-                            user_identity=user_identity,
-                            incident_id=record.id,
-                            update_id=update_id,
-                            template_name=template_name,
-                            is_system_note=is_system_note,
-                        )
-                    # On update: do nothing - preserve existing value
-                # Editable system fields: set on creation, auto-update on edits
-                elif is_create:
+                if is_create or field.is_auto_update_field():
                     should_set = True
-                    value_to_set = SystemValueDeriver.derive_value(
-                        field.system_value,
-                        user_identity=user_identity,
-                        incident_id=record.id,
-                        update_id=update_id,
-                        template_name=template_name,
-                        is_system_note=is_system_note,
-                    )
-                elif field.is_auto_update_field():
-                    # Auto-update on edit (editable=True means "update on edit" for system fields)
-                    should_set = True
-                    value_to_set = SystemValueDeriver.derive_value(
-                        field.system_value,
-                        user_identity=user_identity,
-                        incident_id=record.id,
-                        update_id=update_id,
-                        template_name=template_name,
-                        is_system_note=is_system_note,
-                    )
+                    value_to_set = SystemValueDeriver.derive_value(field.system_value, ctx)
             
             # Case 2: Field has default value and is currently empty (only on creation)
             elif is_create and field.default is not None:
-                # Check if field is empty
-                field_is_empty = True
-                if field.value_type == "string":
-                    values = record.kv_strings.get(field_name, []) if record.kv_strings else []
-                    field_is_empty = not values or not any(v.strip() for v in values)
-                elif field.value_type == "integer":
-                    field_is_empty = not record.kv_integers or field_name not in record.kv_integers
-                elif field.value_type == "float":
-                    field_is_empty = not record.kv_floats or field_name not in record.kv_floats
-                
-                if field_is_empty:
+                if self._field_is_empty(record, field_name, field.value_type):
                     should_set = True
-                    value_to_set = SystemValueDeriver.resolve_default_value(
-                        field.default,
-                        user_identity=user_identity,
-                        incident_id=record.id,
-                        update_id=update_id,
-                        template_name=template_name,
-                    )
+                    value_to_set = SystemValueDeriver.resolve_default_value(field.default, ctx)
             
             # Apply the value if needed
             if should_set and value_to_set is not None:
-                # Initialize KV dicts if needed
-                if not record.kv_strings:
-                    record.kv_strings = {}
-                if not record.kv_integers:
-                    record.kv_integers = {}
-                if not record.kv_floats:
-                    record.kv_floats = {}
-                
                 # Handle multi-value fields properly
                 if field.field_type == "multi":
                     # For multi-value fields, check if value_to_set is already a list
@@ -4828,25 +5159,40 @@ class IncidentManager:
                         values = [value_to_set]
                     
                     if field.value_type == "string":
-                        record.kv_strings[field_name] = values
+                        kv_strings[field_name] = values
                     elif field.value_type == "integer":
-                        record.kv_integers[field_name] = [int(v) for v in values]
+                        kv_integers[field_name] = [int(v) for v in values]
                     elif field.value_type == "float":
-                        record.kv_floats[field_name] = [float(v) for v in values]
+                        kv_floats[field_name] = [float(v) for v in values]
                 else:
                     # Single-value field
                     if field.value_type == "string":
-                        record.kv_strings[field_name] = [value_to_set]
+                        kv_strings[field_name] = [value_to_set]
                     elif field.value_type == "integer":
-                        record.kv_integers[field_name] = [int(value_to_set)]
+                        kv_integers[field_name] = [int(value_to_set)]
                     elif field.value_type == "float":
-                        record.kv_floats[field_name] = [float(value_to_set)]
+                        kv_floats[field_name] = [float(value_to_set)]
     
     @staticmethod
     def _generate_timestamp() -> str:
-        """Generate ISO 8601 timestamp with Z suffix."""
-        return datetime.datetime.now(datetime.UTC).isoformat().replace("+00:00", "Z")
+        """Generate ISO 8601 timestamp with Z suffix (in place of the "+00:00" a UTC isoformat() ends with)."""
+        return datetime.datetime.now(datetime.UTC).isoformat()[:-6] + "Z"
     
+    @staticmethod
+    def _field_is_empty(record: Union[Incident, IncidentUpdate], name: str, value_type: str) -> bool:
+        """
+        Check whether a record has no value for a field (blank strings count as
+        empty). The record's kv_strings/kv_integers/kv_floats must be dicts.
+        """
+        if value_type == "string":
+            values = record.kv_strings.get(name)
+            return not values or not any(v.strip() for v in values)
+        if value_type == "integer":
+            return name not in record.kv_integers
+        if value_type == "float":
+            return name not in record.kv_floats
+        return True
+
     def _remove_kv(self, incident: Incident, key: str, value: Optional[Any] = None) -> None:
         """
         Remove KV entry from incident.
@@ -4870,15 +5216,20 @@ class IncidentManager:
             if key in incident.kv_secure:
                 del incident.kv_secure[key]
         else:
-            # Remove specific value
-            if key in incident.kv_strings:
-                incident.kv_strings[key] = [v for v in incident.kv_strings[key] if v != str(value)]
-            if key in incident.kv_integers:
-                incident.kv_integers[key] = [v for v in incident.kv_integers[key] if v != int(value)]
-            if key in incident.kv_floats:
-                incident.kv_floats[key] = [v for v in incident.kv_floats[key] if v != float(value)]
-            if key in incident.kv_secure:
-                incident.kv_secure[key] = [v for v in incident.kv_secure[key] if v != str(value)]
+            # Remove specific value, converted once for each store holding the
+            # key; a list without it is left alone
+            for store, convert in (
+                (incident.kv_strings, str),
+                (incident.kv_integers, int),
+                (incident.kv_floats, float),
+                (incident.kv_secure, str),
+            ):
+                values = store.get(key)
+                if values is None:
+                    continue
+                target = convert(value)
+                if target in values:
+                    store[key] = [v for v in values if v != target]
     
     def _get_kv_store_for_type(
         self,
@@ -4895,12 +5246,8 @@ class IncidentManager:
         Returns:
             (kv_store_dict, conversion_function)
         """
-        if kvtype == KVParser.TYPE_INTEGER:
-            return incident.kv_integers, int
-        elif kvtype == KVParser.TYPE_FLOAT:
-            return incident.kv_floats, float
-        else:  # STRING or None - default to string
-            return incident.kv_strings, str
+        attr, converter = self._KV_STORE_FOR_TYPE.get(kvtype, self._DEFAULT_KV_STORE)
+        return getattr(incident, attr), converter
     
     def _apply_kv_changes_with_validation(
         self,
@@ -4948,29 +5295,23 @@ class IncidentManager:
                 # Validation failed - offer to edit
                 corrected = self._handle_validation_error(incident, e, allow_validation_editor)
                 
-                if corrected:
-                    # User edited - validate the edited incident
-                    incident = corrected
-                    already_edited_in_validation = True
-                    
-                    try:
-                        # Validate all fields in edited incident
-                        self._validate_incident_fields(incident)
-                        # Validation passed - clear CLI KV so we don't re-apply
-                        parsed_single = []
-                        parsed_multi = []
-                        break
-                        
-                    except ValueError as e2:
-                        # Editor result still invalid - show error and loop
-                        print(f"\nValidation error in edited record: {e2}", file=sys.stderr)
-                        # Clear parsed KV so we only validate the edited incident on retry
-                        parsed_single = []
-                        parsed_multi = []
-                        continue
-                else:
+                if not corrected:
                     # User abandoned - let the caller handle this
                     raise
+                
+                # User edited - the CLI KV is now part of the edited incident,
+                # so don't re-apply it whether or not the edit validates
+                incident = corrected
+                already_edited_in_validation = True
+                parsed_single, parsed_multi = [], []
+                
+                try:
+                    # Validate all fields in edited incident
+                    self._validate_incident_fields(incident)
+                    break
+                except ValueError as e2:
+                    # Editor result still invalid - show error and loop
+                    print(f"\nValidation error in edited record: {e2}", file=sys.stderr)
         
         return incident, already_edited_in_validation
     
@@ -5077,26 +5418,14 @@ class IncidentManager:
         field = self.project_config.get_special_field(key, for_record=True)
         
         if not field:  # Not a special field
-            # Check existing values
-            existing_values = None
-            if key in incident.kv_strings:
-                existing_values = incident.kv_strings[key]
-            elif key in incident.kv_integers:
-                existing_values = incident.kv_integers[key]
-            elif key in incident.kv_floats:
-                existing_values = incident.kv_floats[key]
+            # Check existing values (from the first store holding the key)
+            for kv_store in (incident.kv_strings, incident.kv_integers, incident.kv_floats):
+                existing_values = kv_store.get(key)
+                if existing_values is not None:
+                    break
             
             if existing_values and len(existing_values) > 1:
-                # Determine the type for the error message
-                if kvtype == KVParser.TYPE_STRING or kvtype is None:
-                    flag_hint = "--text-multi/--tm"
-                elif kvtype == KVParser.TYPE_INTEGER:
-                    flag_hint = "--number-multi/--nm"
-                elif kvtype == KVParser.TYPE_FLOAT:
-                    flag_hint = "--decimal-multi/--dm"
-                else:
-                    flag_hint = "--kmv (legacy)"
-                
+                flag_hint = self._MULTI_FLAG_HINTS.get(kvtype, "--kmv (legacy)")
                 raise ValueError(
                     f"Cannot use single-value operator on multi-value field '{key}' "
                     f"(current values: {existing_values}). Use {flag_hint} instead."
@@ -5158,83 +5487,59 @@ class IncidentManager:
                 template_fields = self.project_config.get_special_fields_for_template(template_id, for_record=True)
                 field = template_fields.get(key)
 
+        # Normalize once: every multi-value path below works on `values`
+        is_list = isinstance(value, list)
+        values = value if is_list else [value]
+
         if field:
             # Special field - validate against config, ignore type hint
             if not field.editable and not is_create:
                 raise ValueError(f"'{key}' cannot be edited")
 
             # Validate directly against the field definition (template-aware)
-            values_to_validate = [value] if field.field_type == "single" else (
-                value if isinstance(value, list) else [value]
-            )
-            for v in values_to_validate:
-                if not field.validate(v):
-                    raise ValueError(
-                        f"Invalid {key}: {v}. Accepted: {', '.join(field.accepted_values)}"
-                    )
+            is_single = field.field_type == "single"
+            invalid = field.invalid_values([value] if is_single else values)
+            if invalid:
+                raise ValueError(
+                    f"Invalid {key}: {invalid[0]}. Accepted: {', '.join(field.accepted_values)}"
+                )
             
-            # Store with config-defined type
-            if field.value_type == "string":
-                if field.field_type == "single":
-                    incident.kv_strings[key] = [value]
-                else:  # multi
-                    if not isinstance(value, list):
-                        value = [value]
-                    if replace or key not in incident.kv_strings:
-                        incident.kv_strings[key] = value
-                    else:
-                        incident.kv_strings[key].extend(value)
-            elif field.value_type == "integer":
-                if field.field_type == "single":
-                    incident.kv_integers[key] = [int(value)]
-                else:  # multi
-                    if not isinstance(value, list):
-                        value = [value]
-                    int_values = [int(v) for v in value]
-                    if replace or key not in incident.kv_integers:
-                        incident.kv_integers[key] = int_values
-                    else:
-                        incident.kv_integers[key].extend(int_values)
-            elif field.value_type == "float":
-                if field.field_type == "single":
-                    incident.kv_floats[key] = [float(value)]
-                else:  # multi
-                    if not isinstance(value, list):
-                        value = [value]
-                    float_values = [float(v) for v in value]
-                    if replace or key not in incident.kv_floats:
-                        incident.kv_floats[key] = float_values
-                    else:
-                        incident.kv_floats[key].extend(float_values)
-            elif field.value_type == "securestring":
+            # Store with config-defined type: pick the store once, then one
+            # replace/extend path serves every value type
+            value_type = field.value_type
+            if value_type == "string":
+                kv_store, converter = incident.kv_strings, None
+            elif value_type == "integer":
+                kv_store, converter = incident.kv_integers, int
+            elif value_type == "float":
+                kv_store, converter = incident.kv_floats, float
+            elif value_type == "securestring":
                 if not hasattr(incident, 'kv_secure') or incident.kv_secure is None:
                     incident.kv_secure = {}
-                if field.field_type == "single":
-                    incident.kv_secure[key] = [str(value)]
-                else:  # multi
-                    if not isinstance(value, list):
-                        value = [value]
-                    str_values = [str(v) for v in value]
-                    if replace or key not in incident.kv_secure:
-                        incident.kv_secure[key] = str_values
-                    else:
-                        incident.kv_secure[key].extend(str_values)
+                kv_store, converter = incident.kv_secure, str
+            else:
+                return
+            
+            new_values = [value] if is_single else values
+            if converter is not None:
+                new_values = [converter(v) for v in new_values]
+            if is_single or replace or key not in kv_store:
+                kv_store[key] = new_values
+            else:
+                kv_store[key].extend(new_values)
         else:
             # Non-special field - use type hint
             kv_store, converter = self._get_kv_store_for_type(kvtype, incident)
             
             if replace or key not in kv_store:
-                # Replace mode or new key
-                if isinstance(value, list):
-                    kv_store[key] = [converter(v) for v in value]
+                # Replace mode or new key (a bare None clears the field)
+                if not is_list and value is None:
+                    kv_store[key] = []
                 else:
-                    kv_store[key] = [converter(value)] if value is not None else []
+                    kv_store[key] = [converter(v) for v in values]
             else:
                 # Append mode
-                if isinstance(value, list):
-                    kv_store[key].extend([converter(v) for v in value])
-                else:
-                    kv_store[key].append(converter(value))
+                kv_store[key].extend([converter(v) for v in values])
 
     def _create_incident_with_yaml(
         self,
@@ -5260,9 +5565,6 @@ class IncidentManager:
         Returns:
             Edited incident ready to save, or None if cancelled
         """
-        import tempfile
-        import os
-        
         while True:
             # Prepare incident for editing (filter non-editable fields)
             editable_incident = self._prepare_incident_for_editing(initial_incident)
@@ -5270,25 +5572,14 @@ class IncidentManager:
             # Generate markdown with yaml frontmatter
             markdown_content = editable_incident.to_markdown(self.project_config)
             
-            # Create temp file
-            with tempfile.NamedTemporaryFile(
-                mode='w',
-                suffix='.md',
-                delete=False,
-                encoding='utf-8',
-            ) as tmp_file:
-                tmp_file.write(markdown_content)
-                tmp_path = tmp_file.name
-            
             try:
                 # Launch editor
                 editor_result = EditorConfig.launch_editor(
                     initial_content=markdown_content,
                 )
                 
-                # User cancelled in editor
-                if editor_result is None or editor_result.strip() == markdown_content.strip():
-                    os.unlink(tmp_path)
+                # User cancelled in editor (saved without changes)
+                if self._editor_left_unchanged(editor_result, markdown_content):
                     return None
                 
                 # Try to parse the edited content
@@ -5315,27 +5606,24 @@ class IncidentManager:
                                     edited_incident.kv_secure[key] = orig_values.copy()
 
                     # Success!
-                    os.unlink(tmp_path)
                     return edited_incident
 
                 except Exception as parse_error:
                     # Parsing failed - ask user what to do
-                    print(f"\n{'='*70}", file=sys.stderr)
-                    print(f"ERROR: Failed to parse edited markdown", file=sys.stderr)
-                    print(f"{'='*70}", file=sys.stderr)
-                    print(f"{str(parse_error)}", file=sys.stderr)
-                    print(f"{'='*70}\n", file=sys.stderr)
-                    
-                    print("Options:", file=sys.stderr)
-                    print("  [r] Retry - reopen editor with your changes", file=sys.stderr)
-                    print("  [f] Fresh - restart with template", file=sys.stderr)
-                    print("  [c] Cancel - abort creation", file=sys.stderr)
+                    self._write_banner(
+                        "ERROR: Failed to parse edited markdown",
+                        str(parse_error),
+                        options=(
+                            "[r] Retry - reopen editor with your changes",
+                            "[f] Fresh - restart with template",
+                            "[c] Cancel - abort creation",
+                        ),
+                    )
                     
                     choice = input("\nChoice (r/f/c): ").strip().lower()
                     
                     if choice == 'c':
                         # Cancel
-                        os.unlink(tmp_path)
                         return None
                     elif choice == 'f':
                         # Start fresh - reset to initial template
@@ -5355,46 +5643,30 @@ class IncidentManager:
             except Exception as e:
                 # Editor launch failed or other unexpected error
                 print(f"Error during editing: {e}", file=sys.stderr)
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
                 return None
      
     def _format_incident_update(self, id: str) -> str:
         """Format initial update message from all KV data."""
 
         incident = self.storage.load_incident(id, self.project_config)
-        lines = ["## Record Data"]
-        lines.append("")
+        lines = ["## Record Data", ""]
 
         # Add description if present
         if incident.content:
-            lines.append("### Content")
-            lines.append("")
-            lines.append(incident.content)
-            lines.append("")
-            lines.append("---")
-            lines.append("")
-        
-        # System fields to skip
-        skip_fields = {}
+            lines.extend(("### Content", "", incident.content, "", "---", ""))
         
-        # Format all string KV that isn't in skip list
-        for key, values in incident.kv_strings.items():
-            if key not in skip_fields and values:
-                values_str = ', '.join(str(v) for v in values)
-                lines.append(f"**{key}:** {values_str}")
-        
-        # Format all integer KV
-        for key, values in incident.kv_integers.items():
-            if values:
-                values_str = ', '.join(str(v) for v in values)
-                lines.append(f"**{key}:** {values_str}")
+        # Format all string KV (loaded values are already str)
+        lines.extend(
+            f"**{key}:** {', '.join(values)}"
+            for key, values in incident.kv_strings.items() if values
+        )
         
-        # Format all float KV
-        for key, values in incident.kv_floats.items():
-            if values:
-                values_str = ', '.join(str(v) for v in values)
-                lines.append(f"**{key}:** {values_str}")
+        # Format all integer and float KV
+        for kv_store in (incident.kv_integers, incident.kv_floats):
+            lines.extend(
+                f"**{key}:** {', '.join(map(str, values))}"
+                for key, values in kv_store.items() if values
+            )
 
         lines.append("\n\n")
 
@@ -5409,7 +5681,8 @@ class IncidentManager:
         
         Creates a copy of the incident with only editable fields in the KV stores.
         Non-editable special fields will be preserved from the original and restored
-        after editing.
+        after editing. The copy shares its value lists with the original (callers
+        only serialize it), so copy a list before changing it.
         
         Args:
             incident: Original incident to prepare
@@ -5422,30 +5695,24 @@ class IncidentManager:
         editable_incident.content = incident.content
 
         # Get special fields configuration
-        template_id = incident.kv_strings.get('template_id', [None])[0] if incident.kv_strings else None
-        special_fields = self.project_config.get_special_fields_for_template(template_id, for_record=True)
-        non_editable_fields = {
-            name for name, field_def in special_fields.items()
-            if not field_def.editable
-        }
-
-        # Copy only editable string fields
-        for key, values in incident.kv_strings.items():
-            base_key = self._strip_type_suffix(key)  # FIXED: Strip suffix before checking
-            if base_key not in non_editable_fields:
-                editable_incident.kv_strings[key] = values.copy()
-
-        # Copy only editable integer fields
-        for key, values in incident.kv_integers.items():
-            base_key = self._strip_type_suffix(key)  # FIXED: Strip suffix before checking
-            if base_key not in non_editable_fields:
-                editable_incident.kv_integers[key] = values.copy()
+        special_fields, non_editable_fields, _ = self.project_config.get_record_field_views(
+            self._get_incident_template_id(incident)
+        )
+        strip = self._strip_type_suffix
 
-        # Copy only editable float fields
-        for key, values in incident.kv_floats.items():
-            base_key = self._strip_type_suffix(key)  # FIXED: Strip suffix before checking
-            if base_key not in non_editable_fields:
-                editable_incident.kv_floats[key] = values.copy()
+        # Keep only editable fields
+        editable_incident.kv_strings = {
+            key: values for key, values in incident.kv_strings.items()
+            if strip(key) not in non_editable_fields
+        }
+        editable_incident.kv_integers = {
+            key: values for key, values in incident.kv_integers.items()
+            if strip(key) not in non_editable_fields
+        }
+        editable_incident.kv_floats = {
+            key: values for key, values in incident.kv_floats.items()
+            if strip(key) not in non_editable_fields
+        }
 
         # For securestring fields: editable ones show the mask; non-editable are stripped
         if incident.kv_secure:
@@ -5473,30 +5740,25 @@ class IncidentManager:
             original_incident: Original incident with all fields
             edited_incident: Edited incident to restore fields to
         """
-        template_id = original_incident.kv_strings.get('template_id', [None])[0] if original_incident.kv_strings else None
-        special_fields = self.project_config.get_special_fields_for_template(template_id, for_record=True)
-        non_editable_fields = {
-            name for name, field_def in special_fields.items()
-            if not field_def.editable
-        }
+        special_fields, non_editable_fields, _ = self.project_config.get_record_field_views(
+            self._get_incident_template_id(original_incident)
+        )
+        strip = self._strip_type_suffix
 
         # Restore non-editable string fields
-        for key in original_incident.kv_strings.keys():
-            base_key = self._strip_type_suffix(key)  # FIXED: Strip suffix before checking
-            if base_key in non_editable_fields:
-                edited_incident.kv_strings[key] = original_incident.kv_strings[key].copy()
+        for key, values in original_incident.kv_strings.items():
+            if strip(key) in non_editable_fields:
+                edited_incident.kv_strings[key] = values.copy()
 
         # Restore non-editable integer fields
-        for key in original_incident.kv_integers.keys():
-            base_key = self._strip_type_suffix(key)  # FIXED: Strip suffix before checking
-            if base_key in non_editable_fields:
-                edited_incident.kv_integers[key] = original_incident.kv_integers[key].copy()
+        for key, values in original_incident.kv_integers.items():
+            if strip(key) in non_editable_fields:
+                edited_incident.kv_integers[key] = values.copy()
 
         # Restore non-editable float fields
-        for key in original_incident.kv_floats.keys():
-            base_key = self._strip_type_suffix(key)  # FIXED: Strip suffix before checking
-            if base_key in non_editable_fields:
-                edited_incident.kv_floats[key] = original_incident.kv_floats[key].copy()
+        for key, values in original_incident.kv_floats.items():
+            if strip(key) in non_editable_fields:
+                edited_incident.kv_floats[key] = values.copy()
 
         # Handle securestring fields:
         # - Non-editable: always restore from original
@@ -5567,27 +5829,19 @@ class IncidentManager:
             incident = self.storage.load_incident(incident_id, self.project_config)
             if not incident:
                 raise RuntimeError(f"Incident {incident_id} not found")
+            # The yaml editor restores non-editable fields from the record as
+            # loaded; snapshot it before CLI changes are applied in place
+            # rather than having the editor re-read it from disk
+            original_incident = copy.deepcopy(incident) if use_editor and use_yaml_editor else None
         
             # Detect template from incident's template_id field
             incident_template_id = self._get_incident_template_id(incident)
             if incident_template_id:
                 # Check if template still exists
                 if not self.project_config.has_template(incident_template_id):
-                    print(
-                        f"\n{'='*70}",
-                        file=sys.stderr
-                    )
-                    print(
-                        f"WARNING: Record was created with template '{incident_template_id}'",
-                        file=sys.stderr
-                    )
-                    print(
-                        f"but that template no longer exists in the configuration.",
-                        file=sys.stderr
-                    )
-                    print(
-                        f"{'='*70}\n",
-                        file=sys.stderr
+                    self._write_banner(
+                        f"WARNING: Record was created with template '{incident_template_id}'\n"
+                        "but that template no longer exists in the configuration."
                     )
                     
                     response = input("Proceed with update using global fields only? (y/n): ").strip().lower()
@@ -5706,7 +5960,9 @@ class IncidentManager:
                 elif use_editor and use_yaml_editor:
                     # NEW BEHAVIOR: Edit full record with yaml frontmatter
                     while True:  # ← NEW: Validation loop
-                        final_incident = self._edit_incident_with_yaml(incident)
+                        final_incident = self._edit_incident_with_yaml(
+                            incident, original_incident=original_incident
+                        )
                         
                         if not final_incident:
                             # User cancelled
@@ -5722,15 +5978,14 @@ class IncidentManager:
                             
                         except ValueError as e:
                             # Validation failed - ask user
-                            print(f"\n{'='*70}", file=sys.stderr)
-                            print(f"VALIDATION ERROR in edited record", file=sys.stderr)
-                            print(f"{'='*70}", file=sys.stderr)
-                            print(f"{str(e)}", file=sys.stderr)
-                            print(f"{'='*70}\n", file=sys.stderr)
-                            
-                            print("Options:", file=sys.stderr)
-                            print("  [e] Edit - reopen editor to correct the error", file=sys.stderr)
-                            print("  [a] Abandon - cancel this update", file=sys.stderr)
+                            self._write_banner(
+                                "VALIDATION ERROR in edited record",
+                                str(e),
+                                options=(
+                                    "[e] Edit - reopen editor to correct the error",
+                                    "[a] Abandon - cancel this update",
+                                ),
+                            )
                             
                             choice = input("\nChoice (e/a): ").strip().lower()
                             
@@ -5765,6 +6020,7 @@ class IncidentManager:
         
             # Save and reindex
             written_content = self.storage.save_incident(incident, self.project_config)
+            self._template_resolve_cache.pop(incident.id, None)
             self.index_db.index_incident(
                 incident, self.project_config,
                 file_path=self.storage._get_incident_path(incident.id),
@@ -5790,44 +6046,31 @@ class IncidentManager:
             )
 
             if not skip_update_note:
-                update_msg = ""
+                # Collect the message in parts and join once at the end
+                msg_parts: List[str] = []
 
                 # Append previous content to update message if it was changed
                 if previous_content and incident.content != previous_content:
-                    update_msg += f"\n\n## Previous Content\n\n{previous_content}"
+                    msg_parts.append(f"\n\n## Previous Content\n\n{previous_content}")
                 # Log update
 
                 if updated_fields:
                     updated_fields_str = '\n * '.join(updated_fields)
-                    update_msg += f"\n\n## Updated Fields: \n{updated_fields_str}"
-                    update_msg += f"\n\n"
+                    msg_parts.append(f"\n\n## Updated Fields: \n{updated_fields_str}\n\n")
 
-                update_msg += f"\n\n## Previous Key/Vals\n"
+                msg_parts.append("\n\n## Previous Key/Vals\n")
 
-                # System fields to skip
-                skip_fields = {}
-
-                # Format all string KV that isn't in skip list
-                for key, values in orig_kv_strings.items():
-                    if key not in skip_fields and values:
-                        values_str = ', '.join(str(v) for v in values)
-                        update_msg += f"{key}: {values_str}\n"
-
-                # Format all integer KV
-                for key, values in orig_kv_integers.items():
-                    if values:
-                        values_str = ', '.join(str(v) for v in values)
-                        update_msg += f"{key}: {values_str}\n"
-
-                # Format all float KV
-                for key, values in orig_kv_floats.items():
-                    if values:
-                        values_str = ', '.join(str(v) for v in values)
-                        update_msg += f"{key}: {values_str}\n"
+                # Format all string, integer and float KV (one line each)
+                for kv_store in (orig_kv_strings, orig_kv_integers, orig_kv_floats):
+                    msg_parts.extend(
+                        f"{key}: {', '.join(map(str, values))}\n"
+                        for key, values in kv_store.items() if values
+                    )
 
                 # Format secure KV (masked — never log plaintext)
-                for key in (orig_kv_secure or {}):
-                    update_msg += f"{key}: {{securestring}}\n"
+                msg_parts.extend(f"{key}: {{securestring}}\n" for key in (orig_kv_secure or {}))
+
+                update_msg = "".join(msg_parts)
 
                 update_id = IDGenerator.generate_update_id()
 
@@ -5893,6 +6136,7 @@ class IncidentManager:
     def _edit_incident_with_yaml(
         self,
         incident: Incident,
+        original_incident: Optional[Incident] = None,
     ) -> Optional[Incident]:
         """
         Launch editor with full incident in yaml frontmatter format.
@@ -5908,102 +6152,100 @@ class IncidentManager:
         
         Args:
             incident: Incident to edit (with CLI updates already applied)
+            original_incident: Record before CLI updates, used to restore
+                non-editable fields and for a fresh restart; defaults to a copy
+                of incident
             
         Returns:
             Edited incident with non-editable fields restored, or None if cancelled
         """
-        import tempfile
-        import os
+        # Keep original for field restoration (never re-read from disk)
+        if original_incident is None:
+            original_incident = copy.deepcopy(incident)
         
-        # Keep original for field restoration
-        original_incident = self.storage.load_incident(incident.id, self.project_config)
+        # One temp file serves every retry; launch_editor() rewrites it in place
+        with tempfile.NamedTemporaryFile(
+            mode="w", suffix=".txt", delete=False, dir=EditorConfig.get_temp_dir(),
+        ) as f:
+            tmp_path = f.name
         
-        while True:
-            # Prepare incident for editing (filter non-editable fields)
-            editable_incident = self._prepare_incident_for_editing(incident)
-            
-            # Generate markdown with yaml frontmatter
-            markdown_content = editable_incident.to_markdown(self.project_config)
+        try:
+            while True:
+                # Prepare incident for editing (filter non-editable fields)
+                editable_incident = self._prepare_incident_for_editing(incident)
             
-            # Create temp file
-            with tempfile.NamedTemporaryFile(
-                mode='w',
-                suffix='.md',
-                delete=False,
-                encoding='utf-8',
-            ) as tmp_file:
-                tmp_file.write(markdown_content)
-                tmp_path = tmp_file.name
+                # Generate markdown with yaml frontmatter
+                markdown_content = editable_incident.to_markdown(self.project_config)
             
-            try:
-                # Launch editor
-                editor_result = EditorConfig.launch_editor(
-                    initial_content=markdown_content,
-                )
-                
-                # User cancelled in editor
-                if editor_result is None or editor_result.strip() == markdown_content.strip():
-                    os.unlink(tmp_path)
-                    return None
-                
-                # Try to parse the edited content
                 try:
-                    edited_incident = Incident.from_markdown(
-                        editor_result,
-                        incident.id,
-                        self.project_config,
+                    # Launch editor
+                    editor_result = EditorConfig.launch_editor(
+                        initial_content=markdown_content,
+                        temp_path=tmp_path,
                     )
+                
+                    # User cancelled in editor (saved without changes)
+                    if self._editor_left_unchanged(editor_result, markdown_content):
+                        return None
+                
+                    # Try to parse the edited content
+                    try:
+                        edited_incident = Incident.from_markdown(
+                            editor_result,
+                            incident.id,
+                            self.project_config,
+                        )
                     
-                    # Restore non-editable fields
-                    self._restore_non_editable_fields(original_incident, edited_incident)
-                    
-                    # Success!
-                    os.unlink(tmp_path)
-                    return edited_incident
+                        # Restore non-editable fields
+                        self._restore_non_editable_fields(original_incident, edited_incident)
                     
-                except Exception as parse_error:
-                    # Parsing failed - ask user what to do
-                    print(f"\n{'='*70}", file=sys.stderr)
-                    print(f"ERROR: Failed to parse edited markdown", file=sys.stderr)
-                    print(f"{'='*70}", file=sys.stderr)
-                    print(f"{str(parse_error)}", file=sys.stderr)
-                    print(f"{'='*70}\n", file=sys.stderr)
+                        # Success!
+                        return edited_incident
                     
-                    print("Options:", file=sys.stderr)
-                    print("  [r] Retry - reopen editor with your changes", file=sys.stderr)
-                    print("  [f] Fresh - restart with original content", file=sys.stderr)
-                    print("  [c] Cancel - abort this update", file=sys.stderr)
+                    except Exception as parse_error:
+                        # Parsing failed - ask user what to do
+                        self._write_banner(
+                            "ERROR: Failed to parse edited markdown",
+                            str(parse_error),
+                            options=(
+                                "[r] Retry - reopen editor with your changes",
+                                "[f] Fresh - restart with original content",
+                                "[c] Cancel - abort this update",
+                            ),
+                        )
                     
-                    choice = input("\nChoice (r/f/c): ").strip().lower()
+                        choice = input("\nChoice (r/f/c): ").strip().lower()
                     
-                    if choice == 'c':
-                        # Cancel
-                        os.unlink(tmp_path)
-                        return None
-                    elif choice == 'f':
-                        # Start fresh with original
-                        incident = original_incident
-                        continue
-                    else:
-                        # Retry with user's edits (default)
-                        # Update incident with the corrupted content so it shows in next iteration
-                        # We need to at least preserve the content part even if KV is broken
-                        try:
-                            # Try to extract just the content portion
-                            if '---' in editor_result:
-                                parts = editor_result.split('---', 2)
-                                if len(parts) >= 3:
-                                    incident.content = parts[2].strip()
-                        except:
-                            pass
-                        continue
+                        if choice == 'c':
+                            # Cancel
+                            return None
+                        elif choice == 'f':
+                            # Start fresh with original
+                            incident = original_incident
+                            continue
+                        else:
+                            # Retry with user's edits (default)
+                            # Update incident with the corrupted content so it shows in next iteration
+                            # We need to at least preserve the content part even if KV is broken
+                            try:
+                                # Try to extract just the content portion
+                                if '---' in editor_result:
+                                    parts = editor_result.split('---', 2)
+                                    if len(parts) >= 3:
+                                        incident.content = parts[2].strip()
+                            except:
+                                pass
+                            continue
                         
-            except Exception as e:
-                # Editor launch failed or other unexpected error
-                print(f"Error during editing: {e}", file=sys.stderr)
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
-                return None
+                except Exception as e:
+                    # Editor launch failed or other unexpected error
+                    print(f"Error during editing: {e}", file=sys.stderr)
+                    return None
+        finally:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
                 
     def _validate_incident_fields(self, incident: Incident) -> None:
         """
@@ -6019,24 +6261,11 @@ class IncidentManager:
         Raises:
             ValueError: If any field fails validation
         """
-        # Check if incident has a template_id to get template-specific fields
-        template_id = None
-        if incident.kv_strings and 'template_id' in incident.kv_strings:
-            template_id = incident.kv_strings['template_id'][0]
-        
-        if template_id:
-            # Get template-specific fields (global + template overrides)
-            all_fields = self.project_config.get_special_fields_for_template(
-                template_id,
-                for_record=True,
-            )
-            special_fields = {
-                name: field for name, field in all_fields.items()
-                if field.enabled
-            }
-        else:
-            # Use global fields
-            special_fields = self.project_config.get_enabled_special_fields()
+        # Enabled fields for the incident's template (global + template
+        # overrides), or the global ones when it has none
+        _, _, special_fields = self.project_config.get_record_field_views(
+            self._get_incident_template_id(incident)
+        )
         
         # First, validate required fields are present
         is_valid, error_msg = self.project_config.validate_required_fields(incident)
@@ -6181,9 +6410,10 @@ class IncidentManager:
             # Using a record as template - copy its editable fields
             incident = Incident(id=incident_id)
             editable_template = self._prepare_incident_for_editing(template_incident)
-            incident.kv_strings = editable_template.kv_strings.copy()
-            incident.kv_integers = editable_template.kv_integers.copy()
-            incident.kv_floats = editable_template.kv_floats.copy()
+            # Own copies of the value lists: CLI values may be appended below
+            incident.kv_strings = {k: v.copy() for k, v in editable_template.kv_strings.items()}
+            incident.kv_integers = {k: v.copy() for k, v in editable_template.kv_integers.items()}
+            incident.kv_floats = {k: v.copy() for k, v in editable_template.kv_floats.items()}
             incident.content = editable_template.content
         else:
             # Initialize empty incident (may have config template with content)
@@ -6283,15 +6513,14 @@ class IncidentManager:
                     
                 except ValueError as e:
                     # Validation failed - ask user
-                    print(f"\n{'='*70}", file=sys.stderr)
-                    print(f"VALIDATION ERROR in edited record", file=sys.stderr)
-                    print(f"{'='*70}", file=sys.stderr)
-                    print(f"{str(e)}", file=sys.stderr)
-                    print(f"{'='*70}\n", file=sys.stderr)
-                    
-                    print("Options:", file=sys.stderr)
-                    print("  [e] Edit - reopen editor to correct the error", file=sys.stderr)
-                    print("  [a] Abandon - cancel this creation", file=sys.stderr)
+                    self._write_banner(
+                        "VALIDATION ERROR in edited record",
+                        str(e),
+                        options=(
+                            "[e] Edit - reopen editor to correct the error",
+                            "[a] Abandon - cancel this creation",
+                        ),
+                    )
                     
                     choice = input("\nChoice (e/a): ").strip().lower()
                     
@@ -6330,19 +6559,18 @@ class IncidentManager:
                 self._validate_incident_fields(incident)
             except ValueError as e:
                 # Validation failed - show error and offer to fix
-                print(f"\n{'='*70}", file=sys.stderr)
-                print(f"VALIDATION ERROR", file=sys.stderr)
-                print(f"{'='*70}", file=sys.stderr)
-                print(f"{str(e)}", file=sys.stderr)
-                print(f"{'='*70}\n", file=sys.stderr)
-                print("", file=sys.stderr)
-                print("The record cannot be saved because required fields are missing.", file=sys.stderr)
-                print("Please provide all required fields or use the editor to complete the record.", file=sys.stderr)
-                print("", file=sys.stderr)
+                self._write_banner("VALIDATION ERROR", str(e))
+                sys.stderr.write(
+                    "\n"
+                    "The record cannot be saved because required fields are missing.\n"
+                    "Please provide all required fields or use the editor to complete the record.\n"
+                    "\n"
+                )
                 raise ValueError(f"Record creation failed: {str(e)}")
 
         # Save to file
         written_content = self.storage.save_incident(incident, self.project_config)
+        self._template_resolve_cache.pop(incident.id, None)
 
         # Update index
         self.index_db.index_incident(
@@ -6496,9 +6724,6 @@ class IncidentManager:
         Returns:
             Tuple of (message, kv_strings, kv_integers, kv_floats) or None if cancelled
         """
-        import tempfile
-        import os
-        
         while True:
             # Create a temporary incident to use the to_markdown/from_markdown infrastructure
             temp_incident = Incident(id="temp")
@@ -6510,25 +6735,14 @@ class IncidentManager:
             # Generate markdown with yaml frontmatter
             markdown_content = temp_incident.to_markdown(self.project_config)
             
-            # Create temp file
-            with tempfile.NamedTemporaryFile(
-                mode='w',
-                suffix='.md',
-                delete=False,
-                encoding='utf-8',
-            ) as tmp_file:
-                tmp_file.write(markdown_content)
-                tmp_path = tmp_file.name
-            
             try:
                 # Launch editor
                 editor_result = EditorConfig.launch_editor(
                     initial_content=markdown_content,
                 )
                 
-                # User cancelled in editor
-                if editor_result is None or editor_result.strip() == markdown_content.strip():
-                    os.unlink(tmp_path)
+                # User cancelled in editor (saved without changes)
+                if self._editor_left_unchanged(editor_result, markdown_content):
                     return None
                 
                 # Try to parse the edited content
@@ -6546,27 +6760,24 @@ class IncidentManager:
                     kv_floats = edited_incident.kv_floats
                     
                     # Success!
-                    os.unlink(tmp_path)
                     return (message, kv_strings, kv_integers, kv_floats)
                     
                 except Exception as parse_error:
                     # Parsing failed - ask user what to do
-                    print(f"\n{'='*70}", file=sys.stderr)
-                    print(f"ERROR: Failed to parse edited markdown", file=sys.stderr)
-                    print(f"{'='*70}", file=sys.stderr)
-                    print(f"{str(parse_error)}", file=sys.stderr)
-                    print(f"{'='*70}\n", file=sys.stderr)
-                    
-                    print("Options:", file=sys.stderr)
-                    print("  [r] Retry - reopen editor with your changes", file=sys.stderr)
-                    print("  [f] Fresh - restart with template", file=sys.stderr)
-                    print("  [c] Cancel - abort note creation", file=sys.stderr)
+                    self._write_banner(
+                        "ERROR: Failed to parse edited markdown",
+                        str(parse_error),
+                        options=(
+                            "[r] Retry - reopen editor with your changes",
+                            "[f] Fresh - restart with template",
+                            "[c] Cancel - abort note creation",
+                        ),
+                    )
                     
                     choice = input("\nChoice (r/f/c): ").strip().lower()
                     
                     if choice == 'c':
                         # Cancel
-                        os.unlink(tmp_path)
                         return None
                     elif choice == 'f':
                         # Start fresh
@@ -6585,8 +6796,6 @@ class IncidentManager:
             except Exception as e:
                 # Editor launch failed or other unexpected error
                 print(f"Error during editing: {e}", file=sys.stderr)
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
                 return None
 
     def add_update(
@@ -6636,21 +6845,9 @@ class IncidentManager:
         if parent_template_id:
             # Check if template still exists
             if not self.project_config.has_template(parent_template_id):
-                print(
-                    f"\n{'='*70}",
-                    file=sys.stderr
-                )
-                print(
-                    f"WARNING: Parent record was created with template '{parent_template_id}'",
-                    file=sys.stderr
-                )
-                print(
-                    f"but that template no longer exists in the configuration.",
-                    file=sys.stderr
-                )
-                print(
-                    f"{'='*70}\n",
-                    file=sys.stderr
+                self._write_banner(
+                    f"WARNING: Parent record was created with template '{parent_template_id}'\n"
+                    "but that template no longer exists in the configuration."
                 )
                 
                 response = input("Proceed with note creation using global fields only? (y/n): ").strip().lower()
@@ -6948,6 +7145,7 @@ class IncidentManager:
         # Apply special fields to parent incident (auto-update fields with editable=true + system_value)
         self._apply_special_fields(incident, is_create=False, update_id=update_id, for_notes=False)
         self.storage.save_incident(incident, self.project_config)
+        self._template_resolve_cache.pop(incident.id, None)
         
         return update_id
 
@@ -7029,15 +7227,14 @@ class IncidentManager:
             raise validation_error
         
         # Interactive mode - offer choices
-        print(f"\n{'='*70}", file=sys.stderr)
-        print(f"VALIDATION ERROR", file=sys.stderr)
-        print(f"{'='*70}", file=sys.stderr)
-        print(f"{str(validation_error)}", file=sys.stderr)
-        print(f"{'='*70}\n", file=sys.stderr)
-        
-        print("Options:", file=sys.stderr)
-        print("  [e] Edit - open editor to correct the error", file=sys.stderr)
-        print("  [a] Abandon - cancel this operation", file=sys.stderr)
+        self._write_banner(
+            "VALIDATION ERROR",
+            str(validation_error),
+            options=(
+                "[e] Edit - open editor to correct the error",
+                "[a] Abandon - cancel this operation",
+            ),
+        )
         
         choice = input("\nChoice (e/a): ").strip().lower()
         
@@ -7748,18 +7945,9 @@ class IncidentCLI:
         # Check for explicit flags
         if use_git_id:
             # Determine the best config hint for the notice
-            config = DatabaseDiscovery.get_user_config()
-            libraries = config.get("libraries", {})
             matched_alias = None
             if db_path:
-                db_path_resolved = Path(db_path).resolve()
-                for alias, lib_config in libraries.items():
-                    try:
-                        if Path(lib_config["path"]).resolve() == db_path_resolved:
-                            matched_alias = alias
-                            break
-                    except Exception:
-                        continue
+                matched_alias = DatabaseDiscovery.find_library_alias(db_path)
             
             print(
                 f"\nNotice: Using git identity: {git_identity['handle']} <{git_identity['email']}>",
@@ -9210,16 +9398,10 @@ $update_kv
         if args.location:
             db_root = Path(args.location)
         else:
-            try:
-                result = subprocess.run(
-                    ["git", "rev-parse", "--show-toplevel"],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
-                repo_root = Path(result.stdout.strip())
+            repo_root = DatabaseDiscovery.get_git_repo_root()
+            if repo_root is not None:
                 db_root = repo_root / ".aver"
-            except subprocess.CalledProcessError:
+            else:
                 db_root = Path.cwd() / ".aver"
 
         if not DatabaseDiscovery.enforce_repo_boundary(
@@ -5955,6 +5955,9 @@ main() {
     test_validate_config
     test_exit_codes
     test_ignore_updates
+    test_git_identity
+    test_ksearch_parsing
+    test_fts_index_maintenance
 
     # Summary
     print_section "Test Summary"
@@ -7717,6 +7720,434 @@ test_ignore_updates() {
     fi
 }
 
+#==============================================================================
+# Test: git identity read from config files
+#==============================================================================
+
+# Run a record creation from $1 and print what aver reports for git identity.
+# The test user is 'testuser', so any other git identity triggers the
+# "Identity mismatch" error, which shows aver's view of the git values.
+git_identity_seen_by_aver() {
+    # AVER_PATH may be relative to the directory the suite started in
+    local abs_aver
+    abs_aver=$(realpath "$AVER_PATH")
+    (AVER_PATH="$abs_aver"; cd "$1" && run_aver record new --description "" --no-validation-editor \
+        --title "Git identity probe" 2>&1) || true
+}
+
+# Check aver's git identity in $1 against git's own answer (and $2/$3)
+check_git_identity() {
+    local dir="$1" want_name="$2" want_email="$3"
+    local git_name git_email output
+    git_name=$(git -C "$dir" config user.name)
+    git_email=$(git -C "$dir" config user.email)
+    if [ "$git_name" != "$want_name" ] || [ "$git_email" != "$want_email" ]; then
+        fail "Test setup: git itself reports '$git_name' <$git_email>"
+        return
+    fi
+    output=$(git_identity_seen_by_aver "$dir")
+    if echo "$output" | grep -qF "vs git='$want_name'" && \
+       echo "$output" | grep -qF "vs git='$want_email'"; then
+        pass
+    else
+        fail "aver's git identity differs from git's ('$want_name' <$want_email>): $output"
+    fi
+}
+
+test_git_identity() {
+    print_section "Test: Git Identity From Config Files"
+
+    if ! command -v git > /dev/null 2>&1; then
+        echo "  git not installed - skipping"
+        return
+    fi
+
+    local git_home="$TEST_HOME"
+    local gitconfig="$git_home/.gitconfig"
+    local repo="$git_home/git-id-repo"
+    rm -f "$gitconfig"
+    rm -rf "$repo" "$git_home/git-id-worktree"
+    git init -q "$repo"
+
+    # -------------------------------------------------------------------------
+    # 1. [user] sections in both global and repo config: repo keys win,
+    #    keys only set globally still apply; repeated sections merge
+    # -------------------------------------------------------------------------
+    print_test "[user] split across global and repeated repo sections"
+    track_command "aver record new (in git repo with global + local [user])"
+    cat > "$gitconfig" << 'GITEOF'
+[user]
+    name = Global Name
+    email = global@example.com
+GITEOF
+    cat >> "$repo/.git/config" << 'GITEOF'
+[user]
+    name = First Local
+[core]
+    autocrlf = false
+[user]
+    email = local@example.com
+[User]
+    Name = Local Name
+GITEOF
+    check_git_identity "$repo" "Local Name" "local@example.com"
+
+    # -------------------------------------------------------------------------
+    # 2. Quoted values with escapes
+    # -------------------------------------------------------------------------
+    print_test "Quoted git config values with escapes"
+    track_command "aver record new (in git repo with quoted user.name)"
+    git -C "$repo" config --replace-all user.name 'Quote "Q" Back\slash'
+    git -C "$repo" config --replace-all user.email 'quoted@example.com'
+    check_git_identity "$repo" 'Quote "Q" Back\slash' "quoted@example.com"
+
+    # -------------------------------------------------------------------------
+    # 3. [include] paths in the global config
+    # -------------------------------------------------------------------------
+    print_test "[include] path in global git config"
+    track_command "aver record new (in git repo, identity via [include])"
+    git -C "$repo" config --unset-all user.name
+    git -C "$repo" config --unset-all user.email
+    cat > "$git_home/git-identity.inc" << 'GITEOF'
+[user]
+    name = Included Name
+    email = included@example.com
+GITEOF
+    cat > "$gitconfig" << GITEOF
+[user]
+    name = Global Name
+    email = global@example.com
+[include]
+    path = $git_home/git-identity.inc
+GITEOF
+    check_git_identity "$repo" "Included Name" "included@example.com"
+
+    # -------------------------------------------------------------------------
+    # 4. Linked worktree (.git is a file): repo config comes from the
+    #    main repository's common git dir
+    # -------------------------------------------------------------------------
+    print_test "Linked worktree with a .git file"
+    track_command "aver record new (in git worktree)"
+    rm -f "$gitconfig"
+    git -C "$repo" config user.name "Worktree Name"
+    git -C "$repo" config user.email "worktree@example.com"
+    git -C "$repo" commit -q --allow-empty -m "init"
+    git -C "$repo" worktree add -q "$git_home/git-id-worktree" 2> /dev/null
+    if [ -f "$git_home/git-id-worktree/.git" ]; then
+        check_git_identity "$git_home/git-id-worktree" "Worktree Name" "worktree@example.com"
+    else
+        fail "Test setup: git worktree add did not create a .git file"
+    fi
+
+    rm -f "$gitconfig" "$git_home/git-identity.inc"
+    rm -rf "$repo" "$git_home/git-id-worktree"
+}
+
+#==============================================================================
+# Test: ksearch expression parsing (fast path vs full operator scan)
+#==============================================================================
+
+# Print the sorted KVP-* record titles matched by one --ksearch expression
+ksearch_kvp_titles() {
+    run_aver record list --ksearch "$1" --limit 1000 2>&1 | grep -oE "KVP-[A-Z]+" | sort | tr '\n' ' ' | sed 's/ $//'
+}
+
+# Check that --ksearch "$1" matches exactly the KVP-* titles in $2
+check_ksearch() {
+    local expr="$1" expected="$2" got
+    track_command "aver record list --ksearch '$expr'"
+    got=$(ksearch_kvp_titles "$expr")
+    if [ "$got" = "$expected" ]; then
+        pass
+    else
+        fail "--ksearch '$expr' matched [$got], expected [$expected]"
+    fi
+}
+
+test_ksearch_parsing() {
+    print_section "Test: ksearch Expression Parsing"
+
+    # A single operator takes the one-scan fast path; '^' or a second
+    # operator character in the expression takes the full priority scan.
+    # Both must split key/operator/value the same way.
+    local spec
+    for spec in "KVP-A|kvp_code=alpha|kvp_num=1" \
+                "KVP-B|kvp_code=beta|kvp_num=5" \
+                "KVP-C|kvp_code=gamma|kvp_num=9" \
+                "KVP-D|kvp_expr=a=b|" \
+                "KVP-E|kvp_expr=x<y|" \
+                'KVP-F|kvp_code="quoted val"|' \
+                "KVP-G|kvp_expr=x<=y|"; do
+        local title="${spec%%|*}" rest="${spec#*|}"
+        local text_kv="${rest%%|*}" num_kv="${rest#*|}"
+        if [ -n "$num_kv" ]; then
+            run_aver record new --description "" --no-validation-editor --title "$title" \
+                --text "$text_kv" --number "$num_kv" > /dev/null 2>&1
+        else
+            run_aver record new --description "" --no-validation-editor --title "$title" \
+                --text "$text_kv" > /dev/null 2>&1
+        fi
+    done
+
+    # Fast path: exactly one comparison operator
+    print_test "ksearch fast path: key=value"
+    check_ksearch "kvp_code=alpha" "KVP-A"
+
+    print_test "ksearch fast path: spaces around the operator"
+    check_ksearch "kvp_code = alpha" "KVP-A"
+
+    print_test "ksearch fast path: >= on an integer field"
+    check_ksearch "kvp_num>=5" "KVP-B KVP-C"
+
+    print_test "ksearch fast path: <= on an integer field"
+    check_ksearch "kvp_num<=5" "KVP-A KVP-B"
+
+    print_test "ksearch fast path: quoted value is matched literally"
+    check_ksearch 'kvp_code="quoted val"' "KVP-F"
+
+    print_test "ksearch fast path: != operator"
+    check_ksearch "kvp_num!=5" "KVP-A KVP-C KVP-D KVP-E KVP-F KVP-G"
+
+    print_test "ksearch fast path: <> operator"
+    check_ksearch "kvp_num<>5" "KVP-A KVP-C KVP-D KVP-E KVP-F KVP-G"
+
+    # Full parser: '^', two-character inequality, or operator chars in the value
+    print_test "ksearch full parser: ^ (in) operator"
+    check_ksearch "kvp_code^alpha|gamma" "KVP-A KVP-C"
+
+    print_test "ksearch full parser: '=' inside the value"
+    check_ksearch "kvp_expr=a=b" "KVP-D"
+
+    print_test "ksearch full parser: '<' inside the value"
+    check_ksearch "kvp_expr=x<y" "KVP-E"
+
+    # The full scan tries '<=' before '=', so this splits as
+    # ('kvp_expr=x', '<=', 'y') and matches nothing -- not KVP-G
+    print_test "ksearch full parser: '<=' outranks an earlier '='"
+    check_ksearch "kvp_expr=x<=y" ""
+
+    # Type suffixes are part of the key as written; neither path strips them
+    print_test "ksearch keeps a type suffix in the key (fast path)"
+    check_ksearch "kvp_code__string=alpha" ""
+
+    print_test "ksearch keeps a type suffix in the key (full parser)"
+    check_ksearch "kvp_expr__string=a=b" ""
+}
+
+# Record IDs whose text matches FTS query $1, one per line; $2 limits the
+# match to one source ('incident' or 'update')
+fts_match_ids() {
+    local source_filter=""
+    [ -n "$2" ] && source_filter="AND source = '$2'"
+    sqlite3 "$TEST_DIR/aver.db" \
+        "SELECT DISTINCT incident_id FROM incidents_fts WHERE incidents_fts MATCH '$1' $source_filter ORDER BY incident_id;"
+}
+
+# Titles of the FTS-* records in the order 'record list' prints them
+# with the given --ksort keys
+ksort_fts_titles() {
+    local args=() key
+    for key in "$@"; do
+        args+=(--ksort "$key")
+    done
+    run_aver record list --ksearch fts_set=1 --limit 1000 "${args[@]}" 2>&1 \
+        | grep -oE "FTS-[A-Z]+" | tr '\n' ' ' | sed 's/ $//'
+}
+
+# Check that 'record list --ksort $1 [--ksort $2 ...]' orders the FTS-*
+# records as in $expected
+check_ksort() {
+    local expected="$1" got
+    shift
+    track_command "aver record list --ksort $*"
+    got=$(ksort_fts_titles "$@")
+    if [ "$got" = "$expected" ]; then
+        pass
+    else
+        fail "--ksort $* gave [$got], expected [$expected]"
+    fi
+}
+
+test_fts_index_maintenance() {
+    print_section "Test: Full-Text Index Maintenance"
+
+    local db="$TEST_DIR/aver.db"
+    local rec_a rec_b
+    rec_a=$(run_aver record new --no-validation-editor --title "FTS-A" --text fts_set=1 \
+        --description "ftsbefore ftsshared" --tags fts-m --tags fts-b 2>&1 | grep -oE "REC-[A-Z0-9]+" | head -1)
+    rec_b=$(run_aver record new --no-validation-editor --title "FTS-B" --text fts_set=1 \
+        --description "ftsshared" --tags fts-c --number fts_n=2 2>&1 | grep -oE "REC-[A-Z0-9]+" | head -1)
+    run_aver record new --description "" --no-validation-editor --title "FTS-C" --text fts_set=1 \
+        --number fts_n=1 > /dev/null 2>&1
+    run_aver record new --description "" --no-validation-editor --title "FTS-D" --text fts_set=1 \
+        --tags fts-a --tags fts-z > /dev/null 2>&1
+    run_aver note add "$rec_a" --message "ftsquokka" > /dev/null 2>&1
+
+    print_test "FTS finds record and note text"
+    track_command "sqlite3 aver.db \"... WHERE incidents_fts MATCH 'ftsshared'\""
+    if [ -n "$rec_a" ] && [ -n "$rec_b" ] && \
+       [ "$(fts_match_ids ftsshared)" = "$(printf '%s\n' "$rec_a" "$rec_b" | sort)" ] && \
+       [ "$(fts_match_ids ftsquokka)" = "$rec_a" ]; then
+        pass
+    else
+        fail "Unexpected FTS matches: ftsshared=[$(fts_match_ids ftsshared)] ftsquokka=[$(fts_match_ids ftsquokka)]"
+    fi
+
+    # Updating a record rewrites its fts_source row; the triggers must drop
+    # the old tokens and index the new ones without touching its notes (the
+    # old text lives on in the update's history note)
+    print_test "FTS follows a record update"
+    cat > "$TEST_DIR/fts_update.md" << 'UPDATE_EOF'
+---
+title: FTS-A
+status: open
+priority: medium
+fts_set: 1
+tags:
+  - fts-m
+  - fts-b
+---
+ftsafter ftsshared
+UPDATE_EOF
+    track_command "aver record update $rec_a --from-file fts_update.md"
+    if run_aver record update "$rec_a" --from-file "$TEST_DIR/fts_update.md" > /dev/null 2>&1; then
+        if [ -z "$(fts_match_ids ftsbefore incident)" ] && \
+           [ "$(fts_match_ids ftsafter incident)" = "$rec_a" ] && \
+           [ "$(fts_match_ids ftsquokka update)" = "$rec_a" ]; then
+            pass
+        else
+            fail "Stale FTS after update: ftsbefore=[$(fts_match_ids ftsbefore incident)] ftsafter=[$(fts_match_ids ftsafter incident)] ftsquokka=[$(fts_match_ids ftsquokka update)]"
+        fi
+    else
+        fail "record update failed"
+    fi
+
+    # A forced reindex removes and re-adds every row for the record
+    print_test "FTS has no duplicate rows after a forced reindex"
+    track_command "aver admin reindex $rec_a --force --skip-validation"
+    if run_aver admin reindex "$rec_a" --force --skip-validation > /dev/null 2>&1; then
+        local hits
+        hits=$(sqlite3 "$db" "SELECT COUNT(*) FROM incidents_fts WHERE incidents_fts MATCH 'ftsquokka OR ftsafter';")
+        if [ "$hits" = "2" ]; then
+            pass
+        else
+            fail "Expected 2 FTS rows for $rec_a, found $hits"
+        fi
+    else
+        fail "admin reindex failed"
+    fi
+
+    print_test "FTS index passes integrity-check against fts_source"
+    track_command "sqlite3 aver.db \"INSERT INTO incidents_fts(incidents_fts, rank) VALUES('integrity-check', 1)\""
+    if output=$(sqlite3 "$db" "INSERT INTO incidents_fts(incidents_fts, rank) VALUES('integrity-check', 1);" 2>&1); then
+        pass
+    else
+        fail "integrity-check failed: $output"
+    fi
+
+    # Rewrite the index into the pre-fts_source layout (a content-storing
+    # incidents_fts and no fts_source); the next aver run must migrate it
+    # and keep returning the same records
+    print_test "Legacy FTS index is migrated with the same search results"
+    local before_shared before_note after_shared after_note schema
+    before_shared=$(fts_match_ids ftsshared)
+    before_note=$(fts_match_ids ftsquokka)
+    sqlite3 "$db" << 'LEGACY_EOF'
+DROP TRIGGER IF EXISTS fts_source_ai;
+DROP TRIGGER IF EXISTS fts_source_ad;
+DROP TRIGGER IF EXISTS fts_source_au;
+CREATE TABLE fts_legacy AS SELECT incident_id, source, source_id, content FROM fts_source;
+DROP TABLE incidents_fts;
+DROP TABLE fts_source;
+CREATE VIRTUAL TABLE incidents_fts
+USING fts5(incident_id UNINDEXED, source, source_id UNINDEXED, content);
+INSERT INTO incidents_fts (incident_id, source, source_id, content)
+SELECT incident_id, source, source_id, content FROM fts_legacy;
+DROP TABLE fts_legacy;
+LEGACY_EOF
+    track_command "aver record list (on a legacy index)"
+    run_aver record list > /dev/null 2>&1
+    schema=$(sqlite3 "$db" "SELECT sql FROM sqlite_master WHERE name='incidents_fts';")
+    after_shared=$(fts_match_ids ftsshared)
+    after_note=$(fts_match_ids ftsquokka)
+    if ! echo "$schema" | grep -q "content='fts_source'"; then
+        fail "incidents_fts was not migrated: $schema"
+    elif [ -z "$before_shared" ] || [ "$after_shared" != "$before_shared" ] || \
+         [ -z "$before_note" ] || [ "$after_note" != "$before_note" ]; then
+        fail "Search changed: ftsshared [$before_shared] -> [$after_shared], ftsquokka [$before_note] -> [$after_note]"
+    else
+        pass
+    fi
+
+    print_test "Migrated FTS index passes integrity-check"
+    track_command "sqlite3 aver.db \"INSERT INTO incidents_fts(incidents_fts, rank) VALUES('integrity-check', 1)\""
+    if output=$(sqlite3 "$db" "INSERT INTO incidents_fts(incidents_fts, rank) VALUES('integrity-check', 1);" 2>&1); then
+        pass
+    else
+        fail "integrity-check failed: $output"
+    fi
+
+    # --ksort orders by each key's first value; records missing the key
+    # sort last in either direction, ties keep their listed order
+    print_test "ksort by a multi-valued key uses its first value"
+    check_ksort "FTS-D FTS-B FTS-A FTS-C" tags
+
+    print_test "ksort descending keeps missing keys last"
+    check_ksort "FTS-A FTS-B FTS-D FTS-C" tags-
+
+    print_test "ksort descending on an integer key with missing values"
+    check_ksort "FTS-B FTS-C FTS-A FTS-D" fts_n- tags-
+
+    print_test "ksort by a second key breaks ties on a missing first key"
+    check_ksort "FTS-C FTS-B FTS-D FTS-A" fts_n tags
+
+    # clear_index has no CLI command; call it on the index directly. It
+    # empties incidents_fts with 'delete-all' and fts_source without its
+    # per-row delete trigger, which it must put back
+    print_test "clear_index empties the FTS index and keeps its delete trigger"
+    track_command "IncidentIndexDatabase(aver.db).clear_index()"
+    local remaining trigger
+    if output=$(PYTHONUSERBASE="${ORIGINAL_HOME}/.local" python3 -c "
+import importlib.util, sys
+from pathlib import Path
+spec = importlib.util.spec_from_file_location('aver', sys.argv[1])
+aver = importlib.util.module_from_spec(spec)
+sys.modules['aver'] = aver
+spec.loader.exec_module(aver)
+aver.IncidentIndexDatabase(Path(sys.argv[2])).clear_index()
+" "$AVER_PATH" "$db" 2>&1); then
+        remaining=$(sqlite3 "$db" "SELECT (SELECT COUNT(*) FROM fts_source) + (SELECT COUNT(*) FROM incidents_fts WHERE incidents_fts MATCH 'ftsshared');")
+        trigger=$(sqlite3 "$db" "SELECT name FROM sqlite_master WHERE type='trigger' AND name='fts_source_ad';")
+        if [ "$remaining" != "0" ]; then
+            fail "FTS rows left after clear_index: $remaining"
+        elif [ "$trigger" != "fts_source_ad" ]; then
+            fail "fts_source_ad trigger missing after clear_index"
+        elif ! output=$(sqlite3 "$db" "INSERT INTO incidents_fts(incidents_fts, rank) VALUES('integrity-check', 1);" 2>&1); then
+            fail "integrity-check failed after clear_index: $output"
+        else
+            pass
+        fi
+    else
+        fail "clear_index failed: $output"
+    fi
+
+    # Rebuild, then force a reindex so the recreated trigger deletes rows
+    print_test "FTS index rebuilds after clear_index"
+    track_command "aver admin reindex --skip-validation; aver admin reindex $rec_a --force --skip-validation"
+    if run_aver admin reindex --skip-validation > /dev/null 2>&1 && \
+       run_aver admin reindex "$rec_a" --force --skip-validation > /dev/null 2>&1; then
+        if [ "$(fts_match_ids ftsafter incident)" = "$rec_a" ] && \
+           [ "$(fts_match_ids ftsquokka update)" = "$rec_a" ] && \
+           output=$(sqlite3 "$db" "INSERT INTO incidents_fts(incidents_fts, rank) VALUES('integrity-check', 1);" 2>&1); then
+            pass
+        else
+            fail "FTS not rebuilt: ftsafter=[$(fts_match_ids ftsafter incident)] ftsquokka=[$(fts_match_ids ftsquokka update)] $output"
+        fi
+    else
+        fail "admin reindex failed"
+    fi
+}
+
 # Trap to ensure cleanup on exit
 trap cleanup EXIT INT TERM
 